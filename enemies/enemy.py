@@ -1,9 +1,23 @@
 import pygame
 import os
 import uuid
+from sprite_handler.spriteHandler import SpriteHandler
 
 
 class Enemy(pygame.sprite.Sprite):
+    # (enemy class, display size) -> (image, imgs, attack_imgs, imgs_left), shared by all instances
+    frame_cache = {}
+
+    # Sprites, set by each enemy type. Frame i is sprite_dir/run_frame.format(i)
+    # (or attack_frame); the still image is attack frame 0 at 1/image_scale size.
+    sprite_dir = None
+    run_frame = None
+    attack_frame = None
+    run_frames = 10
+    attack_frames = 10
+    image_scale = 4
+    frame_size = None  # (width, height) of the run/attack frames, None for the still image's size
+
     def __init__(self, x, y, cell_width, cell_height, life=100, points=10, speed=2, damage=0.5):
         # basic
         super().__init__()
@@ -12,6 +26,10 @@ class Enemy(pygame.sprite.Sprite):
         self.id = uuid.uuid4()
         self.damage=damage
 
+        # Set when the enemy's movement is owned by an EnemyStore
+        self.store = None
+        self.slot = None
+
         # path
         self.path = []
         self.collision_rects = []
@@ -19,6 +37,7 @@ class Enemy(pygame.sprite.Sprite):
         self.x = x
         self.y = y
         self.path_pos = 0
+        self.last_repath = None
         self.cell_width = cell_width
         self.cell_height = cell_height
 
@@ -28,8 +47,75 @@ class Enemy(pygame.sprite.Sprite):
         self.animation_count = 0
         self.nearest_target = None
 
+    # pos, path and path_pos read from the EnemyStore arrays while attached to one
+    @property
+    def pos(self):
+        if self.store is not None:
+            return pygame.math.Vector2(*self.store.pos[self.slot])
+        return self._pos
+
+    @pos.setter
+    def pos(self, value):
+        if self.store is not None:
+            self.store.pos[self.slot] = (value[0], value[1])
+        else:
+            self._pos = pygame.math.Vector2(value)
+
+    @property
+    def path(self):
+        return self._path
+
+    @path.setter
+    def path(self, value):
+        if self.store is not None:
+            self.store.set_path(self.slot, value)
+        else:
+            self._path = value
+
+    @property
+    def path_pos(self):
+        if self.store is not None:
+            return int(self.store.path_pos[self.slot])
+        return self._path_pos
+
+    @path_pos.setter
+    def path_pos(self, value):
+        if self.store is not None:
+            self.store.path_pos[self.slot] = value
+        else:
+            self._path_pos = value
+
+    @classmethod
+    def build_frames(cls):
+        """Load and scale (image, run frames, attack frames) for this enemy type."""
+        if cls.sprite_dir is None:
+            raise NotImplementedError(f"{cls.__name__} sets no sprite_dir")
+
+        # Only the PNG header is read to get the still image's size
+        image_path = os.path.join(cls.sprite_dir, cls.attack_frame.format(0))
+        width, height = SpriteHandler.image_size(image_path)
+        scaled_size = (width // cls.image_scale, height // cls.image_scale)
+        image = SpriteHandler.load_sprite(image_path, *scaled_size)
+
+        frame_size = cls.frame_size or scaled_size
+        imgs = [SpriteHandler.load_sprite(os.path.join(cls.sprite_dir, cls.run_frame.format(i)), *frame_size)
+                for i in range(cls.run_frames)]
+        attack_imgs = [SpriteHandler.load_sprite(os.path.join(cls.sprite_dir, cls.attack_frame.format(i)), *frame_size)
+                       for i in range(cls.attack_frames)]
+        return image, imgs, attack_imgs
+
     def load_images(self):
-        pass
+        """Use the class's shared frames, loading them the first time the type is spawned."""
+        surface = pygame.display.get_surface()
+        key = (type(self), surface.get_size() if surface else None)
+        frames = Enemy.frame_cache.get(key)
+        if frames is None:
+            image, imgs, attack_imgs = type(self).build_frames()
+            # Left-facing run frames are flipped once here instead of every tick
+            imgs_left = [pygame.transform.flip(img, True, False) for img in imgs]
+            frames = (image, imgs, attack_imgs, imgs_left)
+            Enemy.frame_cache[key] = frames
+        self.image, self.imgs, self.attack_imgs, self.imgs_left = frames
 
     def play_attack_animation(self):
             """
@@ -85,11 +171,11 @@ class Enemy(pygame.sprite.Sprite):
         direction = direction.normalize()
         self.pos += direction * self.speed
 
-        # Flip the image based on direction
+        # Pick the frame facing the direction of travel
         if direction.x < 0:  # Moving left
-            self.image = pygame.transform.flip(self.imgs[self.animation_count], True, False)
+            self.image = self.imgs_left[self.animation_count]
         elif direction.x > 0:  # Moving right
-            self.image = pygame.transform.flip(self.imgs[self.animation_count], False, False)
+            self.image = self.imgs[self.animation_count]
 
         # Update the enemy's position
         self.rect.center = (int(self.pos.x), int(self.pos.y))
@@ -101,8 +187,12 @@ class Enemy(pygame.sprite.Sprite):
     def attack(self):
         self.nearest_target.take_damage(self.damage)
 
-    def draw(self, win):
-        win.blit(self.image, self.rect.topleft)
+    def draw(self, win, center=None):
+        # center: interpolated position to draw at instead of the rect's
+        if center is None:
+            win.blit(self.image, self.rect.topleft)
+        else:
+            win.blit(self.image, (self.rect.x + center[0] - self.rect.centerx, self.rect.y + center[1] - self.rect.centery))
 
     def take_damage(self, damage):
         self.life -= damage
\ No newline at end of file
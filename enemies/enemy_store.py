@@ -0,0 +1,226 @@
+import numpy as np
+
+
+class EnemyStore:
+    """
+    Structure-of-arrays storage for enemy movement.
+    Positions, speeds, path cursors and waypoints live in NumPy arrays and
+    step() advances every enemy in one batched pass. Enemies on a FieldPath
+    only hold their next cell and get the one after from the flow field when
+    they reach it. The Enemy objects stay
+    around as thin views used for drawing, damage and targeting.
+    Removal swaps the last slot into the hole, so slot order is not spawn
+    order; seq holds each slot's spawn number for anything that needs the
+    game's enemy-list order back (see spawn_order()).
+    """
+    def __init__(self, cell_width, cell_height, capacity=64, max_path_len=64):
+        self.cell_size = np.array([cell_width, cell_height], dtype=np.float64)
+        self.count = 0
+        self.enemies = []  # slot -> Enemy
+        self.fields = []   # slot -> FlowField the enemy steps along, or None
+        self.ended = []    # enemies whose path ran out or was set empty, until take_ended()
+        self.next_seq = 0
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.prev_pos = np.zeros((capacity, 2), dtype=np.float64)  # before the last step, for interpolation
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.path_pos = np.zeros(capacity, dtype=np.int32)
+        self.path_len = np.zeros(capacity, dtype=np.int32)
+        self.waypoints = np.zeros((capacity, max_path_len, 2), dtype=np.float64)
+        self.seq = np.zeros(capacity, dtype=np.int64)  # spawn number, increasing with every add()
+        self.on_field = np.zeros(capacity, dtype=bool)
+        self.field_cell = np.zeros((capacity, 2), dtype=np.int32)  # cell of the waypoint, while on_field
+
+    def grow(self, capacity=None, max_path_len=None):
+        capacity = capacity or len(self.pos)
+        max_path_len = max_path_len or self.waypoints.shape[1]
+
+        def resized(array, shape):
+            new = np.zeros(shape, dtype=array.dtype)
+            new[tuple(slice(0, s) for s in array.shape)] = array
+            return new
+
+        self.pos = resized(self.pos, (capacity, 2))
+        self.prev_pos = resized(self.prev_pos, (capacity, 2))
+        self.speed = resized(self.speed, (capacity,))
+        self.path_pos = resized(self.path_pos, (capacity,))
+        self.path_len = resized(self.path_len, (capacity,))
+        self.waypoints = resized(self.waypoints, (capacity, max_path_len, 2))
+        self.seq = resized(self.seq, (capacity,))
+        self.on_field = resized(self.on_field, (capacity,))
+        self.field_cell = resized(self.field_cell, (capacity, 2))
+
+    def add(self, enemy):
+        if self.count == len(self.pos):
+            self.grow(capacity=self.count * 2)
+
+        slot = self.count
+        self.count += 1
+        self.enemies.append(enemy)
+        self.fields.append(None)
+
+        # Copy the enemy's state in before it starts reading from the store
+        pos, path, path_pos = enemy.pos, enemy.path, enemy.path_pos
+        self.pos[slot] = (pos.x, pos.y)
+        self.prev_pos[slot] = self.pos[slot]
+        self.speed[slot] = enemy.speed
+        self.seq[slot] = self.next_seq
+        self.next_seq += 1
+        enemy.store, enemy.slot = self, slot
+        self.set_path(slot, path)
+        if not self.on_field[slot]:
+            self.path_pos[slot] = path_pos
+
+    def remove(self, enemy):
+        """Swap-remove the enemy's slot and detach it from the store."""
+        slot = enemy.slot
+        last = self.count - 1
+        pos, path, path_pos = enemy.pos, enemy.path, enemy.path_pos
+
+        if slot != last:
+            moved = self.enemies[last]
+            self.enemies[slot] = moved
+            self.fields[slot] = self.fields[last]
+            moved.slot = slot
+            self.pos[slot] = self.pos[last]
+            self.prev_pos[slot] = self.prev_pos[last]
+            self.speed[slot] = self.speed[last]
+            self.path_pos[slot] = self.path_pos[last]
+            self.path_len[slot] = self.path_len[last]
+            self.waypoints[slot] = self.waypoints[last]
+            self.seq[slot] = self.seq[last]
+            self.on_field[slot] = self.on_field[last]
+            self.field_cell[slot] = self.field_cell[last]
+        self.enemies.pop()
+        self.fields.pop()
+        self.count -= 1
+
+        enemy.store, enemy.slot = None, None
+        enemy.pos, enemy.path, enemy.path_pos = pos, path, path_pos
+
+    def spawn_order(self):
+        """Slots sorted by spawn number, i.e. in the order of the game's enemy list."""
+        return np.argsort(self.seq[:self.count], kind="stable")
+
+    def clear(self):
+        for enemy in self.enemies[:]:
+            self.remove(enemy)
+        self.ended.clear()
+
+    def take_ended(self):
+        """Return the enemies whose path ran out since the last call."""
+        ended, self.ended = self.ended, []
+        return ended
+
+    def set_path(self, slot, path):
+        """Load a path (nodes with .x/.y, a GridPath or a FieldPath) as pixel waypoints."""
+        self.enemies[slot]._path = path
+        self.fields[slot] = None
+        self.on_field[slot] = False
+        self.path_pos[slot] = 0  # a new path starts where the enemy stands
+        if hasattr(path, "field"):
+            # Only the first cell to walk to; step() fetches the rest one at a time.
+            # The enemy is already in the start cell, so that one is skipped.
+            self.fields[slot] = path.field
+            self.on_field[slot] = True
+            self.field_cell[slot] = path.field.next_step(*path.start) or path.start
+            self.waypoints[slot, 0] = self.field_cell[slot] * self.cell_size
+            self.path_len[slot] = 1
+            return
+        if path is None or len(path) == 0:
+            self.path_len[slot] = 0
+            self.ended.append(self.enemies[slot])
+            return
+
+        cells = path.cells if hasattr(path, "cells") else np.array([(p.x, p.y) for p in path])
+        if len(cells) > self.waypoints.shape[1]:
+            self.grow(max_path_len=len(cells) * 2)
+        self.waypoints[slot, :len(cells)] = cells * self.cell_size
+        self.path_len[slot] = len(cells)
+
+    def step(self, scale=1.0):
+        """
+        Advance every enemy one tick along its path (same rules as
+        Enemy.move_towards). Speeds are per tick; scale stretches the tick.
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        pos = self.pos[:n]
+        self.prev_pos[:n] = pos
+        cursor = self.path_pos[:n]
+        length = self.path_len[:n]
+        walking = cursor < length
+        speed = self.speed[:n] * scale
+        facing = np.zeros(n, dtype=np.int8)  # -1 left, 1 right, 0 unchanged/not moving
+        moved = np.zeros(n, dtype=bool)
+        finished = np.zeros(n, dtype=bool)    # stepped onto the last waypoint this frame
+
+        idx = np.nonzero(cursor < length)[0]
+        if len(idx):
+            direction = self.waypoints[idx, cursor[idx]] - pos[idx]
+            distance = np.hypot(direction[:, 0], direction[:, 1])
+
+            # Already standing on the waypoint: aim for the next one
+            zero = distance == 0
+            if zero.any():
+                cursor[idx[zero]] += 1
+                retarget = zero & (cursor[idx] < length[idx])
+                direction[retarget] = self.waypoints[idx[retarget], cursor[idx[retarget]]] - pos[idx[retarget]]
+                keep = ~zero | retarget
+                finished[idx[~keep]] = True
+                idx, direction, distance = idx[keep], direction[keep], distance[keep]
+
+            norm = np.hypot(direction[:, 0], direction[:, 1])
+            valid = norm > 0
+            idx, direction, distance, norm = idx[valid], direction[valid], distance[valid], norm[valid]
+
+            pos[idx] += direction / norm[:, None] * speed[idx, None]
+            facing[idx] = np.sign(direction[:, 0]).astype(np.int8)
+            moved[idx] = True
+            cursor[idx[distance <= speed[idx]]] += 1
+
+        # Enemies that reached their field cell get the next one
+        for slot in np.flatnonzero(self.on_field[:n] & (cursor >= length)).tolist():
+            step = self.fields[slot].next_step(*self.field_cell[slot].tolist())
+            if step is None:
+                self.on_field[slot] = False  # at the target; stays arrived from here on
+                continue
+            self.field_cell[slot] = step
+            self.waypoints[slot, 0] = self.field_cell[slot] * self.cell_size
+            cursor[slot] = 0
+
+        for slot in np.flatnonzero(walking & (cursor >= length)).tolist():
+            self.ended.append(self.enemies[slot])
+
+        arrived = (cursor >= length) & (length > 0) & ~moved & ~finished
+        centers = pos.astype(np.int32).tolist()
+        self.sync_views(centers, moved.tolist(), facing.tolist(), arrived.tolist())
+
+    def lerp_centers(self, alpha):
+        """Enemy centers between the last two steps (alpha 0 = previous, 1 = current)."""
+        n = self.count
+        centers = self.prev_pos[:n] + (self.pos[:n] - self.prev_pos[:n]) * alpha
+        return centers.astype(np.int32).tolist()
+
+    def sync_views(self, centers, moved, facing, arrived):
+        """Push the batched results back to the Enemy objects used for drawing."""
+        for slot, enemy in enumerate(self.enemies):
+            enemy.animation_count += 1
+            if enemy.animation_count >= len(enemy.imgs):
+                enemy.animation_count = 0
+
+            if arrived[slot]:
+                if enemy.nearest_target:
+                    enemy.attack()
+                    enemy.play_attack_animation()
+                continue
+            if not moved[slot]:
+                continue
+
+            if facing[slot] < 0:
+                enemy.image = enemy.imgs_left[enemy.animation_count]
+            elif facing[slot] > 0:
+                enemy.image = enemy.imgs[enemy.animation_count]
+            enemy.rect.center = centers[slot]
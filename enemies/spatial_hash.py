@@ -0,0 +1,51 @@
+class SpatialHash:
+    """
+    Uniform grid of enemies on the pathfinder's cell size.
+    Rebuilt once per frame after movement; range queries only look at the
+    cells overlapping the query circle instead of every enemy.
+    """
+    def __init__(self, cell_width, cell_height):
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.buckets = {}  # (col, row) -> [(order, enemy), ...]
+        self.max_extent = 0  # half the widest enemy rect, for rect-vs-rect queries
+
+    def rebuild(self, enemies):
+        buckets = {}
+        max_extent = 0
+        for order, enemy in enumerate(enemies):
+            max_extent = max(max_extent, enemy.rect.width, enemy.rect.height)
+            key = (enemy.rect.centerx // self.cell_width, enemy.rect.centery // self.cell_height)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [(order, enemy)]
+            else:
+                bucket.append((order, enemy))
+        self.buckets = buckets
+        self.max_extent = max_extent / 2
+
+    def query(self, x, y, radius):
+        """
+        Return the enemies in the cells overlapping the circle, in their
+        original list order. Callers still do their own exact range check.
+        """
+        # One extra cell of margin covers rounding between pos and rect
+        col_min = int((x - radius) // self.cell_width) - 1
+        col_max = int((x + radius) // self.cell_width) + 1
+        row_min = int((y - radius) // self.cell_height) - 1
+        row_max = int((y + radius) // self.cell_height) + 1
+
+        found = []
+        if (col_max - col_min + 1) * (row_max - row_min + 1) > len(self.buckets):
+            # Huge circle: walking the occupied buckets is cheaper than the covered cells
+            for (col, row), bucket in self.buckets.items():
+                if col_min <= col <= col_max and row_min <= row <= row_max:
+                    found.extend(bucket)
+        else:
+            for col in range(col_min, col_max + 1):
+                for row in range(row_min, row_max + 1):
+                    bucket = self.buckets.get((col, row))
+                    if bucket:
+                        found.extend(bucket)
+        found.sort(key=lambda item: item[0])
+        return [enemy for _, enemy in found]
@@ -1,56 +1,150 @@
+import os
 import pygame
 import random
 import math
+import argparse
+import time
 
 from sprite_handler.spriteHandler import SpriteHandler
 from resource_manager.resourceManager import ResourceManager
 from towers.main_tower import MainTower
 from towers.fire_tower import FireTower
 from towers.archer_tower import ArcherTower
+from towers.targeting import batched_targets, hash_prunes, BATCHED_TARGETING_MIN_PAIRS
+from towers.tower_index import TowerIndex
 from path_finder import Pathfinder, matrix
+from path_service import PathService, RepathScheduler
 from enemies.orc import Orc
 from enemies.head import HeadMonster
 from enemies.skeleton_monster import SkeletonMonster
 from enemies.stone_monster import StoneMonster
+from enemies.enemy_store import EnemyStore
+from enemies.spatial_hash import SpatialHash
 from tower_selection_panel import TowerSelectionPanel
+from renderer import DirtyRenderer
+from text_cache.textCache import TextCache
+from menu import MenuScreen, Button, outlined_text
+from sim_clock import SimClock, TICK_MS
+from input_log import InputRecorder, SELECT, PLACE, CANCEL, UPGRADE, PAUSE, RESUME, END
+
+# Grid cells enemies spawn on
+SPAWN_POINTS = [(0, 20), (0, 16), (50, 22), (50, 25)]
+STONE_SPAWN_POINTS = [(50, 2), (0, 20)]
+SKELETON_SPAWN_POINTS = [(40, 26), (0, 20)]
+
+# Towers the player can build; input logs refer to them by index
+TOWER_TYPES = [ArcherTower, FireTower]
 
 class Game:
-    def __init__(self) -> None:
+    def __init__(self, headless=False, size=None, seed=None, record=None, deterministic=None) -> None:
+        """
+        headless: no window, audio or image decoding (SDL dummy drivers and
+        blank stand-in sprites), for driving update() from scripts.
+        size: screen size; the default is fullscreen at the display's
+        resolution, or 1920x1080 when headless.
+        seed: seeds the game's random choices; picked at random when None.
+        record: path to write an input log of this game to (see input_log.py).
+        deterministic: solve paths inline and repath everything that is due, so
+        the game only depends on its seed and inputs. On by default when
+        headless or recording.
+        """
+        self.headless = headless
+        if deterministic is None:
+            deterministic = headless or record is not None
+        if headless:
+            # Must be set before pygame.init()
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+            # Nothing reads QUIT events headless, so let SIGINT/SIGTERM stop the process
+            os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+        SpriteHandler.headless = headless
         pygame.init()
 
-        # Initialize the mixer for audio
-        pygame.mixer.init()
-        pygame.mixer.music.load('the-hermit-nostalgic-ancient-harp-259286.mp3')
-        pygame.mixer.music.set_volume(0.4)
-        pygame.mixer.music.play(-1)
+        if not headless:
+            # Initialize the mixer for audio
+            pygame.mixer.init()
+            pygame.mixer.music.load('the-hermit-nostalgic-ancient-harp-259286.mp3')
+            pygame.mixer.music.set_volume(0.4)
+            pygame.mixer.music.play(-1)
 
         pygame.display.set_caption("Werian - Tower Defense")
-        self.screen_info = pygame.display.Info()
-        self.width, self.height = self.screen_info.current_w, self.screen_info.current_h
-        #self.win = pygame.display.set_mode((self.width, self.height))
-        self.win = pygame.display.set_mode((self.width, self.height), pygame.FULLSCREEN)
+        if headless:
+            self.width, self.height = size or (1920, 1080)
+            self.win = pygame.display.set_mode((self.width, self.height))
+        elif size:
+            self.width, self.height = size
+            self.win = pygame.display.set_mode(size)
+        else:
+            self.screen_info = pygame.display.Info()
+            self.width, self.height = self.screen_info.current_w, self.screen_info.current_h
+            #self.win = pygame.display.set_mode((self.width, self.height))
+            self.win = pygame.display.set_mode((self.width, self.height), pygame.FULLSCREEN)
 
         # Cell sizes (for your pathfinder matrix)
         self.cell_width = math.ceil((self.width / 1920) * 40)
         self.cell_height = math.ceil((self.height / 1080) * 40)
 
-        # Init pathfinder
-        self.pathfinder = Pathfinder(
-            matrix=matrix,
-            cell_width=self.cell_width,
-            cell_height=self.cell_height
-        )
+        # Sprites scaled for this resolution are kept on disk for the next launch
+        SpriteHandler.cache_dir = "cache/sprites"
 
         # Load and scale the background
-        self.bg = pygame.image.load("assets/td-tilesets1-2/tower-defense-game-tilesets/PNG/game_background_3/game_background_3.png")
-        self.bg = pygame.transform.scale(self.bg, (self.width, self.height))
+        self.bg = SpriteHandler.load_sprite(
+            "assets/td-tilesets1-2/tower-defense-game-tilesets/PNG/game_background_3/game_background_3.png",
+            self.width, self.height
+        )
+        # In-game frames only redraw and push the regions that changed
+        self.renderer = DirtyRenderer(self.win, self.bg)
 
-        # Enemies
-        self.enemies = []
+        # Rebuilt every frame so towers only look at enemies near them
+        self.enemy_index = SpatialHash(self.cell_width, self.cell_height)
 
-        # Towers
+        # Tower sizes are scaled from the 1440x900 layout
         self.ma_sw = 1440
         self.ma_sh = 900
+
+        # Initialize enemy sprites
+        enemy_sprites = SpriteHandler.load_sprites(
+            ["assets/2d-monster-sprites/PNG/1/1_enemies_1_run_{:03}.png".format(i) for i in range(20)],
+            50, 50
+        )
+
+        self.fps = 60  # render cap; the simulation itself ticks at sim_clock.step_ms
+        self.new_path_interval = 2000
+        # Repaths are spread over frames, at most repath_budget_ms per frame
+        self.repath_budget_ms = None if deterministic else 2
+        self.deterministic = deterministic
+
+        # Create the selection panel (only the windowed game has input)
+        self.tower_panel = None if headless else TowerSelectionPanel(self.width, self.height)
+
+        # Balance overrides keyed by class name, set by tools/simulate.py, e.g.
+        # enemy_stats = {"StoneMonster": {"life": 2500}}, tower_prices = {"ArcherTower": 60}
+        self.enemy_stats = {}
+        self.tower_prices = {}
+
+        # Built by the first reset() and kept for every game after it
+        self.pathfinder = None
+        self.path_service = None
+
+        self.recorder = None
+        self.reset(seed)
+        if record:
+            self.recorder = InputRecorder(record, self.seed, (self.width, self.height))
+
+    def reset(self, seed=None):
+        """
+        Start a new game on the title screen. Everything a game changes is
+        rebuilt; the window, music, loaded sprites and routes are kept, so
+        this is what Retry calls.
+        """
+        # A log only covers one game
+        self.stop_recording()
+
+        # Enemies; their movement is simulated in batch by the store
+        self.enemies = []
+        self.enemy_store = EnemyStore(self.cell_width, self.cell_height)
+
+        # Towers
         self.towers = [
             MainTower(
                 int((830 / self.ma_sw) * self.width), 
@@ -59,16 +153,42 @@ class Game:
                 int((181 / self.ma_sh) * self.height)
             )
         ]
-        
+        self.main_tower = self.towers[0]
+        # The arrow pool is shared by every archer tower, so drop arrows left from an earlier game
+        ArcherTower.projectiles.clear()
+        # Nearest-tower lookups; rebuilt whenever a tower is placed, upgraded or removed
+        self.tower_index = TowerIndex()
+        self.tower_index.rebuild(self.towers)
+
+        if self.pathfinder is None:
+            # Init pathfinder; spawn -> main tower routes are solved (or loaded) up front.
+            # Routes and flow fields only depend on the map, so later games reuse them.
+            self.pathfinder = Pathfinder(
+                matrix=matrix,
+                cell_width=self.cell_width,
+                cell_height=self.cell_height,
+                mode="flow_field",
+                spawn_points=SPAWN_POINTS + STONE_SPAWN_POINTS + SKELETON_SPAWN_POINTS,
+                route_target=self.main_tower.get_coord(self.cell_width, self.cell_height),
+                route_cache_dir="cache/routes"
+            )
+        else:
+            # Searches still running belong to the old game
+            self.path_service.shutdown()
+            self.pathfinder.clear_targets()
+        # Searches run on worker threads; results are picked up in update().
+        # Deterministic runs solve inline so a run only depends on its inputs.
+        self.path_service = PathService(self.pathfinder, workers=0 if self.deterministic else 2)
+
+        for tower in self.towers:
+            self.pathfinder.add_target(tower)
+
         # Initialize resource manager
         self.points_manager = ResourceManager(initial_points=0)
         self.gold_manager = ResourceManager(initial_points=100)
-        
-        # Initialize enemy sprites
-        enemy_sprites = SpriteHandler.load_sprites(
-            ["assets/2d-monster-sprites/PNG/1/1_enemies_1_run_{:03}.png".format(i) for i in range(20)],
-            50, 50
-        )
+
+        # Game logic runs in fixed steps of simulation time; all timers read sim_clock.now
+        self.sim_clock = SimClock()
 
         # Spawn timing variables
         self.last_spawn_time = 0
@@ -81,84 +201,45 @@ class Game:
 
         # State machine
         self.state = 'start'
-        
-        self.last_check_new_path = None
-        self.new_path_interval = 2000
+
+        self.repath_scheduler = RepathScheduler(self.new_path_interval, self.repath_budget_ms)
         self.last_wave = 0
         self.wave_interval = 40000
 
-        # Create the selection panel
-        self.tower_panel = TowerSelectionPanel(self.width, self.height)
         self.selected_tower = None
         # Wave counter
         self.wave_count = 1
 
-    def display_start_menu(self):
-        # Fonts
-        title_font = pygame.font.SysFont(None, 240)
-        button_font = pygame.font.SysFont(None, 64)
-
-        # Render texts
-        title_text = title_font.render("Werian", True, (255, 255, 255))
-        start_text = button_font.render("Start", True, (255, 255, 255))
-        quit_text = button_font.render("Quit", True, (255, 255, 255))
-
-        # Button dimensions
-        button_width, button_height = 200, 80
-        start_button_x = self.width // 2 - button_width // 2
-        start_button_y = int(self.height * 0.6)
-        quit_button_x = self.width // 2 - button_width // 2
-        quit_button_y = int(self.height * 0.72)
-
-        # Title positioning
-        title_x = self.width // 2 - title_text.get_width() // 2
-        title_y = self.height // 2 - title_text.get_height() // 2 - 100  # Slightly above center
+        # Spawns draw from the game's own generator, so a seed replays the same waves
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.ticks = 0  # update() steps run; input logs are stamped with it
+        self.replaying = False
 
-        while self.state == 'start':
-            # Draw background
-            self.win.blit(self.bg, (0, 0))
+        if self.tower_panel:
+            self.tower_panel.selected_tower = None
+        self.renderer.invalidate()
 
-            # Blit the "Werian" text on top of its rectangle
-            self.win.blit(title_text, (title_x, title_y))
+    def display_start_menu(self):
+        screen = MenuScreen(self.win, self.bg)
 
-            # Start button
-            pygame.draw.rect(self.win, (139, 69, 19), (start_button_x, start_button_y, button_width, button_height))
-            pygame.draw.rect(self.win, (0, 0, 0), (start_button_x, start_button_y, button_width, button_height), 3)
-            self.win.blit(start_text, (
-                start_button_x + button_width // 2 - start_text.get_width() // 2,
-                start_button_y + button_height // 2 - start_text.get_height() // 2)
-            )
+        # Title, slightly above center
+        title_text = TextCache.render("Werian", 240, (255, 255, 255))
+        title_x = self.width // 2 - title_text.get_width() // 2
+        title_y = self.height // 2 - title_text.get_height() // 2 - 100
+        screen.add_text(title_text, (title_x, title_y))
 
-            # Quit button
-            pygame.draw.rect(self.win, (139, 69, 19), (quit_button_x, quit_button_y, button_width, button_height))
-            pygame.draw.rect(self.win, (0, 0, 0), (quit_button_x, quit_button_y, button_width, button_height), 3)
-            self.win.blit(quit_text, (
-                quit_button_x + button_width // 2 - quit_text.get_width() // 2,
-                quit_button_y + button_height // 2 - quit_text.get_height() // 2)
-            )
+        button_x = self.width // 2 - 200 // 2
+        screen.add_button(Button("Start", button_x, int(self.height * 0.6)))
+        screen.add_button(Button("Quit", button_x, int(self.height * 0.72)))
 
-            pygame.display.update()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.mixer.music.stop()
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    mx, my = pygame.mouse.get_pos()
-                    # Start button click
-                    if (start_button_x <= mx <= start_button_x + button_width and
-                        start_button_y <= my <= start_button_y + button_height):
-                        self.state = 'running'
-                    # Quit button click
-                    elif (quit_button_x <= mx <= quit_button_x + button_width and
-                        quit_button_y <= my <= quit_button_y + button_height):
-                        pygame.mixer.music.stop()
-                        pygame.quit()
-                        exit()
+        if screen.run() == "Start":
+            self.state = 'running'
+        else:
+            self.quit()
 
     def spawn_enemy(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.sim_clock.now
 
         # Check if enough time has passed to start a new wave
         if current_time - self.last_wave >= self.wave_interval:
@@ -168,87 +249,45 @@ class Game:
             self.wave_count += 1  # <--- Increase wave counter
             
             self.spawn_interval = max(self.spawn_interval - 100, 100)
-            x, y = random.choice([(50, 2), (0, 20)])
-            self.enemies.append(StoneMonster(x, y, self.cell_width, self.cell_height))
+            x, y = self.rng.choice(STONE_SPAWN_POINTS)
+            self.add_enemy(StoneMonster(x, y, self.cell_width, self.cell_height))
             self.last_wave = current_time
             self.wave_interval = max(self.wave_interval - 1000, 2000)
 
             if current_time >= 60000:
-                x, y = random.choice([(40, 26), (0, 20)])
-                self.enemies.append(SkeletonMonster(x, y, self.cell_width, self.cell_height)) 
-
-        spawn_points = [(0, 20), (0, 16), (50, 22), (50, 25)]
-        x, y = random.choice(spawn_points)
-        possible_enemies = [
-            Orc(x, y, self.cell_width, self.cell_height),
-            HeadMonster(x, y, self.cell_width, self.cell_height),
-        ]
-        self.enemies.append(random.choice(possible_enemies))
+                x, y = self.rng.choice(SKELETON_SPAWN_POINTS)
+                self.add_enemy(SkeletonMonster(x, y, self.cell_width, self.cell_height))
+
+        x, y = self.rng.choice(SPAWN_POINTS)
+        enemy_cls = self.rng.choice([Orc, HeadMonster])
+        self.add_enemy(enemy_cls(x, y, self.cell_width, self.cell_height))
+
+    def add_enemy(self, enemy):
+        """Add a freshly spawned enemy, starting it on its precomputed route."""
+        route = self.pathfinder.route_for(enemy, self.main_tower)
+        if route and self.main_tower.life > 0:
+            enemy.path = route
+            enemy.nearest_target = self.main_tower
+            # Fresh unless another tower is closer, then the scheduler reroutes it first
+            if self.find_nearest_tower(enemy)[0] is self.main_tower:
+                enemy.last_repath = self.sim_clock.now
+        for name, value in self.enemy_stats.get(type(enemy).__name__, {}).items():
+            setattr(enemy, name, value)
+        self.enemies.append(enemy)
+        self.enemy_store.add(enemy)
+        self.repath_scheduler.track(enemy)
 
     def display_pause_menu(self):
-        paused = True
-        font = pygame.font.SysFont(None, 128)
-        pause_text = font.render("Paused", True, (255, 255, 255))
-        pause_text_outline = font.render("Paused", True, (0, 0, 0))
-        button_font = pygame.font.SysFont(None, 64)
-
-        button_width, button_height = 200, 80
-        button_x = self.width // 2 - button_width - 10
-        button_y = self.height // 2 + pause_text.get_height() // 2 + 20
-        retry_text = button_font.render("Retry", True, (255, 255, 255))
-
-        button2_x = self.width // 2 + 10
-        quit_text = button_font.render("Quit", True, (255, 255, 255))
-
-        while paused:
-            self.win.blit(self.bg, (0, 0))
-            text_x = self.width // 2 - pause_text.get_width() // 2
-            text_y = self.height // 2 - pause_text.get_height()
-            offsets = [(-2, -2), (-2, 2), (2, -2), (2, 2), (0, -2), (-2, 0), (2, 0), (0, 2)]
-            for dx, dy in offsets:
-                self.win.blit(pause_text_outline, (text_x + dx, text_y + dy))
-
-            self.win.blit(pause_text, (text_x, text_y))
-
-            pygame.draw.rect(self.win, (139, 69, 19), (button_x, button_y, button_width, button_height))
-            pygame.draw.rect(self.win, (0, 0, 0), (button_x, button_y, button_width, button_height), 3)
-            self.win.blit(retry_text, (
-                button_x + button_width // 2 - retry_text.get_width() // 2,
-                button_y + button_height // 2 - retry_text.get_height() // 2)
-            )
-
-            pygame.draw.rect(self.win, (139, 69, 19), (button2_x, button_y, button_width, button_height))
-            pygame.draw.rect(self.win, (0, 0, 0), (button2_x, button_y, button_width, button_height), 3)
-            self.win.blit(quit_text, (
-                button2_x + button_width // 2 - quit_text.get_width() // 2,
-                button_y + button_height // 2 - quit_text.get_height() // 2)
-            )
-
-            pygame.display.update()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.mixer.music.stop()
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        paused = False
-                        self.state = 'running'
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    mx, my = pygame.mouse.get_pos()
-                    # Retry
-                    if button_x <= mx <= button_x + button_width and button_y <= my <= button_y + button_height:
-                        print("Retry button clicked! Restarting the game...")
-                        self.__init__()  # Reinitialize
-                        self.run()
-                        return
-                    # Quit
-                    elif button2_x <= mx <= button2_x + button_width and button_y <= my <= button_y + button_height:
-                        print("Quit button clicked! Exiting the game...")
-                        pygame.mixer.music.stop()
-                        pygame.quit()
-                        exit()
+        choice = self.end_screen("Paused", (255, 255, 255), "Resume")
+        if choice == "Resume":
+            self.handle_input(RESUME)
+        elif choice == "Retry":
+            print("Retry button clicked! Restarting the game...")
+            self.reset()
+        else:
+            if choice == "Quit":
+                print("Quit button clicked! Exiting the game...")
+            self.quit()
 
     def can_place_tower(self, x, y):
         grid_x = x // self.cell_width
@@ -272,21 +311,98 @@ class Game:
 
         return True
 
+    def tower_size(self):
+        return int((166 / self.ma_sw) * self.width), int((181 / self.ma_sh) * self.height)
+
+    def new_tower(self, tower_cls, x, y):
+        """A tower of the size and range placed towers get, with its top-left at (x, y)."""
+        width, height = self.tower_size()
+        tower = tower_cls(x, y, width, height, attack_range=int(self.width * 0.4))
+        if tower_cls.__name__ in self.tower_prices:
+            tower.price = self.tower_prices[tower_cls.__name__]
+        return tower
+
+    def place_tower(self, tower_cls, x, y):
+        """
+        Buy a tower and place it centered on (x, y), as a click on the map does.
+        Returns the new tower, or None if the spot is taken or there isn't enough gold.
+        """
+        if not self.can_place_tower(x, y):
+            return None
+        width, height = self.tower_size()
+        tower = self.new_tower(tower_cls, x - width // 2, y - height // 2)
+        if self.gold_manager.get_points() < tower.price:
+            return None
+        self.gold_manager.deduct_points(tower.price)
+        self.towers.append(tower)
+        self.tower_index.rebuild(self.towers)
+        self.pathfinder.add_target(tower)
+        self.repath_scheduler.expire(self.sim_clock.now)  # reroute right away
+        return tower
+
+    def handle_input(self, kind, arg=0, x=0, y=0):
+        """
+        Apply one player input (kinds from input_log). Inputs are applied
+        between two ticks and logged with the number of ticks run so far.
+        """
+        if self.recorder:
+            self.recorder.record(self.ticks, kind, arg, x, y)
+
+        if kind == SELECT:
+            self.placing_tower = True
+            self.tower_type = TOWER_TYPES[arg]
+            self.tower_preview = self.new_tower(self.tower_type, x, y)
+            self.tower_price = self.tower_preview.price
+        elif kind == PLACE:
+            self.place_tower(TOWER_TYPES[arg], x, y)
+            # Either way, stop placing
+            self.stop_placing()
+        elif kind == CANCEL:
+            self.stop_placing()
+        elif kind == UPGRADE:
+            self.upgrade_tower(self.towers[x])
+        elif kind == PAUSE:
+            self.state = 'paused'
+        elif kind == RESUME:
+            self.state = 'running'
+
+    def stop_placing(self):
+        self.placing_tower = False
+        self.tower_preview = None
+        self.tower_type = None
+
+    def upgrade_tower(self, tower):
+        if self.gold_manager.get_points() < tower.price:
+            return False
+        tower.upgrade()
+        self.tower_index.rebuild(self.towers)
+        self.gold_manager.deduct_points(tower.price)
+        return True
+
+    def stop_recording(self):
+        if self.recorder:
+            self.recorder.close(self.ticks)
+            self.recorder = None
+
     def run(self):
         clock = pygame.time.Clock()
         while True:
             if self.state == 'start':
                 self.display_start_menu()
+                self.renderer.invalidate()
+                self.sim_clock.reset()
 
             if self.state == 'running':
-                clock.tick(30)
-                self.update()
-                self.draw()
+                clock.tick(self.fps)
+                # Catch the simulation up to real time, then draw between its last two steps
+                for _ in range(self.sim_clock.advance()):
+                    self.update(self.sim_clock.step_ms)
+                    if self.state != 'running':
+                        break
+                self.draw(self.sim_clock.alpha)
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
-                        pygame.mixer.music.stop()
-                        pygame.quit()
-                        exit()
+                        self.quit()
 
                     # -- Let the panel handle the event first
                     panel_handled, selected_tower_cls, tower_price = self.tower_panel.handle_event(event)
@@ -294,223 +410,270 @@ class Game:
                         # We clicked inside the panel
                         if selected_tower_cls:
                             # The user clicked on a specific tower icon
-                            self.placing_tower = True
-                            self.tower_type = selected_tower_cls
-                            self.tower_price = tower_price  # store the price if needed
-
-                            # Create the preview tower object
                             pos = pygame.mouse.get_pos()
-                            self.tower_preview = self.tower_type(
-                                pos[0], pos[1],
-                                int((166 / self.ma_sw) * self.width),
-                                int((181 / self.ma_sh) * self.height),
-                                attack_range=int(self.width * 0.4)
-                            )
+                            self.handle_input(SELECT, TOWER_TYPES.index(selected_tower_cls), pos[0], pos[1])
                         # IMPORTANT: skip further checks for this same click
                         continue
 
                     # -- If we get here, the click was NOT inside the panel => check map
                     if event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_ESCAPE:
-                            self.state = 'paused'
+                            self.handle_input(PAUSE)
 
                     # If we are in placement mode
                     if self.placing_tower:
                         if event.type == pygame.MOUSEBUTTONDOWN:
                             pos = pygame.mouse.get_pos()
                             if event.button == 1:  # Left-click => place
-                                if self.can_place_tower(pos[0], pos[1]):
-                                    # Check if we can afford it
-                                    if self.gold_manager.get_points() >= self.tower_preview.price:
-                                        self.gold_manager.deduct_points(self.tower_preview.price)
-                                        # Actually place it
-                                        new_tower = self.tower_type(
-                                            pos[0] - self.tower_preview.width // 2,
-                                            pos[1] - self.tower_preview.height // 2,
-                                            self.tower_preview.width,
-                                            self.tower_preview.height,
-                                            attack_range=self.tower_preview.attack_range
-                                        )
-                                        self.towers.append(new_tower)
-                                # Either way, stop placing
-                                self.placing_tower = False
-                                self.tower_preview = None
-                                self.tower_type = None
+                                self.handle_input(PLACE, TOWER_TYPES.index(self.tower_type), pos[0], pos[1])
 
                             elif event.button == 3:  # Right-click => cancel
-                                self.placing_tower = False
-                                self.tower_preview = None
-                                self.tower_type = None
-
-                current_time = pygame.time.get_ticks()
-                if current_time - self.last_spawn_time >= self.spawn_interval:
-                    self.spawn_enemy()
-                    self.last_spawn_time = current_time
+                                self.handle_input(CANCEL)
 
             elif self.state == 'paused':
                 self.display_pause_menu()
+                self.renderer.invalidate()
+                self.sim_clock.reset()
 
             elif self.state == 'game over':
                 self.display_game_over()
-                return
  
-    def update(self):
-        current_time = pygame.time.get_ticks()
+    def run_headless(self, max_ticks=None):
+        """
+        Step the simulation as fast as possible with no drawing or input, until
+        the main tower falls or max_ticks steps have run. Returns the steps run.
+        """
+        self.state = 'running'
+        ticks = 0
+        while self.state == 'running' and (max_ticks is None or ticks < max_ticks):
+            self.update(self.sim_clock.step_ms)
+            ticks += 1
+        return ticks
+
+    def replay(self, log, render=False, time_scale=None):
+        """
+        Re-drive the game from an InputLog, applying each input after the
+        same tick it was recorded on. The game must have been created with
+        the log's seed and size, in deterministic mode.
+        render draws every frame (needs a window); time_scale then paces the
+        simulation against real time, None runs it as fast as possible.
+        Stops where the recording stopped or when the main tower falls.
+        Returns the wall time of every update() in ms.
+        """
+        self.replaying = True
+        self.state = 'running'
+        if time_scale:
+            self.sim_clock.time_scale = time_scale
+            self.sim_clock.reset()
+        clock = pygame.time.Clock()
+        events = log.events
+        end_tick = log.end_tick
+        next_event = 0
+        update_ms = []
+        while self.state == 'running' and (end_tick is None or self.ticks < end_tick):
+            if end_tick is None and next_event == len(events):
+                break  # cut-off log: nothing more is known about the game
+            if render and time_scale:
+                clock.tick(self.fps)
+                steps = self.sim_clock.advance()
+            else:
+                steps = 1
+
+            for _ in range(steps):
+                while next_event < len(events) and events[next_event].tick <= self.ticks:
+                    event = events[next_event]
+                    next_event += 1
+                    # Pausing never advanced the simulation, so there's nothing to replay
+                    if event.kind not in (PAUSE, RESUME, END):
+                        self.handle_input(event.kind, event.arg, event.x, event.y)
+
+                started = time.perf_counter()
+                self.update(self.sim_clock.step_ms)
+                update_ms.append((time.perf_counter() - started) * 1000)
+                if self.state != 'running' or self.ticks == end_tick:
+                    break
+
+            if render:
+                self.draw(self.sim_clock.alpha if time_scale else 1.0)
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                        return update_ms
+        return update_ms
 
-        if not self.last_check_new_path or current_time - self.last_check_new_path >= self.new_path_interval:
-            for enemy in self.enemies[:]:
-                nearest_tower, _ = self.find_nearest_tower(enemy)
-                self.pathfinder.set_groups(enemy, nearest_tower)
-                enemy.path = self.pathfinder.create_path()
-                enemy.nearest_target = nearest_tower
-            self.last_check_new_path = current_time
+    def update(self, dt=TICK_MS):
+        """Advance the game by one fixed step of dt simulated milliseconds."""
+        current_time = self.sim_clock.step(dt)
+        self.ticks += 1
+        scale = dt / TICK_MS  # speeds are per TICK_MS
+
+        if current_time - self.last_spawn_time >= self.spawn_interval:
+            self.spawn_enemy()
+            self.last_spawn_time = current_time
+
+        self.repath_scheduler.run(current_time, self.repath_enemy, self.path_service.is_pending)
+        self.repath_scheduler.retry(self.path_service.deliver())
+
+        self.enemy_store.step(scale)
+        self.repath_scheduler.path_ended(self.enemy_store.take_ended())
+
+        # The spatial hash serves short-range towers and the arrows' hit tests
+        self.enemy_index.rebuild(self.enemies)
+
+        # Range checks: one vectorized pass for big fights; otherwise the hash for
+        # towers with a short range and a plain scan for those reaching across the map
+        batched = len(self.towers) * len(self.enemies) >= BATCHED_TARGETING_MIN_PAIRS
+        if batched:
+            targets = dict(zip(self.towers, batched_targets(self.towers, self.enemy_store)))
 
-        for enemy in self.enemies[:]:
-            enemy.move_towards()
-        
         # Update towers
         for tower in self.towers[:]:
             if tower.life > 0:
-                tower.attack(self.enemies, current_time)
-                if hasattr(tower, "arrows"):
-                    tower.arrows.update(self.enemies)
+                if batched:
+                    tower.attack_targets(targets[tower], current_time)
+                elif hash_prunes(tower, self.width, self.height):
+                    tower.attack(self.enemy_index.query(*tower.range_circle()), current_time)
+                else:
+                    tower.attack(self.enemies, current_time)
             else:
                 if not isinstance(tower, MainTower):
                     self.towers.remove(tower)
+                    self.tower_index.rebuild(self.towers)
+                    self.pathfinder.remove_target(tower)
+                    self.repath_scheduler.target_lost([enemy for enemy in self.enemies if enemy.nearest_target is tower])
                 else:
                     print("Game Over! The Main Tower has been destroyed.")
                     self.towers.remove(tower)
+                    self.tower_index.rebuild(self.towers)
                     self.state = 'game over'
                     return
 
-    def draw(self):
-        self.win.blit(self.bg, (0, 0))
+        # Move all arrows in flight once
+        ArcherTower.projectiles.update(self.enemy_index, self.win.get_rect(), scale)
 
-        # Draw enemies
+        # Collect the enemies killed this step
         for enemy in self.enemies[:]:
-            if enemy.life > 0:
-                enemy.draw(self.win)
-            else:
+            if enemy.life <= 0:
                 self.points_manager.add_points(enemy.points)
                 self.gold_manager.add_points(enemy.points)
                 self.enemies.remove(enemy)
+                self.enemy_store.remove(enemy)
+
+    def draw(self, alpha=1.0):
+        """Draw the current state; moving things are drawn alpha of the way into the last step."""
+        win = self.renderer.begin()
+
+        # Draw enemies
+        centers = self.enemy_store.lerp_centers(alpha)  # by store slot
+        for enemy in self.enemies:
+            if enemy.life > 0:
+                enemy.draw(win, centers[enemy.slot])
 
         # Draw towers
         for tower in self.towers:
             if tower.life > 0:
-                if isinstance(tower, ArcherTower):
-                    tower.draw(self.win, pygame.time.get_ticks(), self.enemies)
-                else:
-                    tower.draw(self.win, pygame.time.get_ticks())
+                tower.draw(win, self.sim_clock.now)
 
-                # Check if the user clicked on this tower
+                # Check if the user clicked on this tower (a replay has no mouse)
+                if self.replaying:
+                    continue
                 if tower.clicked_for_upgrade():
                     if self.gold_manager.get_points() >= tower.price:
-                        tower.draw_upgrade_button(self.win)
+                        tower.draw_upgrade_button(win)
                         if tower.clicked_plus_rect_upgrade_button():
-                            tower.upgrade()
+                            self.handle_input(UPGRADE, x=self.towers.index(tower))
                             tower.hide_display_upgrade_button()
-                            self.gold_manager.deduct_points(tower.price)
                 
                 if not tower.clicked_for_upgrade():
                     tower.hide_display_upgrade_button()
 
+        # Arrows in flight, for every archer tower at once
+        ArcherTower.projectiles.draw(win, alpha)
+
         # Draw tower preview if we are placing
         if self.placing_tower and self.tower_preview:
-            mx, my = pygame.mouse.get_pos()
-            self.tower_preview.x = mx - self.tower_preview.width // 2
-            self.tower_preview.y = my - self.tower_preview.height // 2
-            if isinstance(self.tower_preview, ArcherTower):
-                self.tower_preview.draw(self.win, pygame.time.get_ticks(), self.enemies)
-            else:
-                self.tower_preview.draw(self.win, pygame.time.get_ticks())
+            if not self.replaying:
+                mx, my = pygame.mouse.get_pos()
+                self.tower_preview.x = mx - self.tower_preview.width // 2
+                self.tower_preview.y = my - self.tower_preview.height // 2
+            self.tower_preview.draw(win, self.sim_clock.now)
 
         # Display resource points
-        font = pygame.font.SysFont(None, int(self.width * 0.035))
-        points_text = font.render(f"Score: {self.points_manager.get_points()}", True, (158, 201, 0))
-        self.win.blit(points_text, (self.width * 0.01, self.height * 0.01))
+        # Labels come from the text cache, so they only re-render when a value changes
+        font_size = int(self.width * 0.035)
+        points_text = TextCache.render(f"Score: {self.points_manager.get_points()}", font_size, (158, 201, 0))
+        win.blit(points_text, (self.width * 0.01, self.height * 0.01))
 
-        gold_text = font.render(f"  Gold: {self.gold_manager.get_points()}", True, (250, 250, 0))
-        self.win.blit(gold_text, (self.width * 0.01, self.height * 0.06))
+        gold_text = TextCache.render(f"  Gold: {self.gold_manager.get_points()}", font_size, (250, 250, 0))
+        win.blit(gold_text, (self.width * 0.01, self.height * 0.06))
 
         # -------------------------------
         # NEW: Display wave counter
         # -------------------------------
-        wave_text = font.render(f" Wave: {self.wave_count}", True, (255, 255, 255))
-        self.win.blit(wave_text, (self.width * 0.01, self.height * 0.11))
+        wave_text = TextCache.render(f" Wave: {self.wave_count}", font_size, (255, 255, 255))
+        win.blit(wave_text, (self.width * 0.01, self.height * 0.11))
 
         # Draw the selection panel
-        self.tower_panel.draw(self.win)
+        self.tower_panel.draw(win)
+
+        self.renderer.end()
 
-        pygame.display.update()
+    def repath_enemy(self, enemy):
+        nearest_tower, _ = self.find_nearest_tower(enemy)
+        self.path_service.request(enemy, nearest_tower)
 
     def find_nearest_tower(self, enemy):
-        nearest_tower = None
-        min_distance = float('inf')
-        
-        for tower in self.towers:
-            distance = math.dist(enemy.pos, (tower.x, tower.y))
-            if distance < min_distance:
-                min_distance = distance
-                nearest_tower = tower
-        return nearest_tower, min_distance
+        # The incremental planner already knows which tower each cell leads to
+        if self.pathfinder.mode == "incremental":
+            return self.pathfinder.target_for(enemy)
+
+        nearest = self.tower_index.nearest(enemy.pos.x, enemy.pos.y)
+        if not nearest:
+            return None, float('inf')
+        return nearest[0]
+
+    def find_nearest_towers(self, enemy, k):
+        """Return up to k [(tower, distance), ...] nearest alive towers, closest first."""
+        return self.tower_index.nearest(enemy.pos.x, enemy.pos.y, k)
     
     def display_game_over(self):
-        font = pygame.font.SysFont(None, 128)
-        game_over_text = font.render("Game Over", True, (0, 255, 0))
-        game_over_outline = font.render("Game Over", True, (0, 0, 0))
-        button_font = pygame.font.SysFont(None, 64)
-        button_width, button_height = 200, 80
-        button_y = self.height // 2 + game_over_text.get_height() // 2 + 20
-        button_x = self.width // 2 - button_width - 10
-        button2_x = self.width // 2 + 10
-        retry_text = button_font.render("Retry", True, (255, 255, 255))
-        quit_text = button_font.render("Quit", True, (255, 255, 255))
-        in_game_over = True
-
-        while in_game_over:
-            self.win.blit(self.bg, (0, 0))
-            text_x = self.width // 2 - game_over_text.get_width() // 2
-            text_y = self.height // 2 - game_over_text.get_height()
-            offsets = [(-2, -2), (-2, 2), (2, -2), (2, 2), (0, -2), (-2, 0), (2, 0), (0, 2)]
-            for dx, dy in offsets:
-                self.win.blit(game_over_outline, (text_x + dx, text_y + dy))
-            self.win.blit(game_over_text, (text_x, text_y))
-
-            pygame.draw.rect(self.win, (139, 69, 19), (button_x, button_y, button_width, button_height))
-            pygame.draw.rect(self.win, (0, 0, 0), (button_x, button_y, button_width, button_height), 3)
-            self.win.blit(retry_text, (
-                button_x + button_width // 2 - retry_text.get_width() // 2,
-                button_y + button_height // 2 - retry_text.get_height() // 2)
-            )
-            pygame.draw.rect(self.win, (139, 69, 19), (button2_x, button_y, button_width, button_height))
-            pygame.draw.rect(self.win, (0, 0, 0), (button2_x, button_y, button_width, button_height), 3)
-            self.win.blit(quit_text, (
-                button2_x + button_width // 2 - quit_text.get_width() // 2,
-                button_y + button_height // 2 - quit_text.get_height() // 2)
-            )
-
-            pygame.display.update()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.mixer.music.stop()
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    mx, my = pygame.mouse.get_pos()
-                    # Retry
-                    if button_x <= mx <= button_x + button_width and button_y <= my <= button_y + button_height:
-                        print("Retry button clicked! Restarting the game...")
-                        self.__init__()
-                        self.run()
-                        return
-                    # Quit
-                    elif button2_x <= mx <= button2_x + button_width and button_y <= my <= button_y + button_height:
-                        print("Quit button clicked! Exiting the game...")
-                        pygame.mixer.music.stop()
-                        pygame.quit()
-                        exit()
+        self.stop_recording()
+        choice = self.end_screen("Game Over", (0, 255, 0))
+        if choice == "Retry":
+            print("Retry button clicked! Restarting the game...")
+            self.reset()
+        else:
+            if choice == "Quit":
+                print("Quit button clicked! Exiting the game...")
+            self.quit()
+
+    def end_screen(self, title, color, escape_choice=None):
+        """Outlined title over Retry/Quit buttons (pause and game over). Returns the choice."""
+        screen = MenuScreen(self.win, self.bg)
+        title_text = outlined_text(title, 128, color)
+        # The outline adds 2px on each side
+        text_height = title_text.get_height() - 4
+        text_x = self.width // 2 - title_text.get_width() // 2
+        text_y = self.height // 2 - text_height - 2
+        screen.add_text(title_text, (text_x, text_y))
+
+        button_y = self.height // 2 + text_height // 2 + 20
+        screen.add_button(Button("Retry", self.width // 2 - 200 - 10, button_y))
+        screen.add_button(Button("Quit", self.width // 2 + 10, button_y))
+        if escape_choice:
+            screen.on_key(pygame.K_ESCAPE, escape_choice)
+        return screen.run()
+
+    def quit(self):
+        self.stop_recording()
+        self.path_service.shutdown()
+        pygame.mixer.music.stop()
+        pygame.quit()
+        exit()
 
 if __name__ == "__main__":
-    g = Game()
+    parser = argparse.ArgumentParser(description="Werian - Tower Defense")
+    parser.add_argument("--seed", type=int, default=None, help="seed for enemy spawns")
+    parser.add_argument("--record", metavar="PATH", help="write an input log for tools/replay.py")
+    args = parser.parse_args()
+    g = Game(seed=args.seed, record=args.record)
     g.run()
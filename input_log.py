@@ -0,0 +1,71 @@
+import struct
+from collections import namedtuple
+
+# Input kinds
+SELECT = 1   # picked a tower in the panel: arg = tower type, (x, y) = mouse
+PLACE = 2    # clicked the map while placing: arg = tower type, (x, y) = click
+CANCEL = 3   # right-clicked while placing
+UPGRADE = 4  # upgraded a tower: x = its index in Game.towers
+PAUSE = 5
+RESUME = 6
+END = 7      # recording stopped (quit, retry or game over)
+
+InputEvent = namedtuple("InputEvent", ["tick", "kind", "arg", "x", "y"])
+
+
+class InputLog:
+    """
+    Every input a game consumed, stamped with the simulation tick it was
+    applied after, plus the seed and screen size needed to replay it.
+
+    File layout (little-endian): a 20-byte header (magic, version, seed,
+    width, height), then one 10-byte record per input (tick, kind, arg, x, y).
+    """
+    HEADER = struct.Struct("<4sIQHH")
+    EVENT = struct.Struct("<IBBhh")
+    MAGIC = b"WLOG"
+    VERSION = 1
+
+    def __init__(self, seed, size, events=None):
+        self.seed = seed
+        self.size = size
+        self.events = events or []
+
+    @property
+    def end_tick(self):
+        """Tick the recording stopped on, or None if it was cut off."""
+        if self.events and self.events[-1].kind == END:
+            return self.events[-1].tick
+        return None
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as f:
+            data = f.read()
+        header = InputLog.HEADER
+        if len(data) < header.size:
+            raise ValueError(f"{path}: not an input log")
+        magic, version, seed, width, height = header.unpack_from(data)
+        if magic != InputLog.MAGIC or version != InputLog.VERSION:
+            raise ValueError(f"{path}: not an input log (or an unsupported version)")
+        body = data[header.size:]
+        # A crash can leave a partial last record; drop it
+        body = body[:len(body) - len(body) % InputLog.EVENT.size]
+        events = [InputEvent(*fields) for fields in InputLog.EVENT.iter_unpack(body)]
+        return InputLog(seed, (width, height), events)
+
+
+class InputRecorder:
+    """Appends inputs to an InputLog file as they happen."""
+    def __init__(self, path, seed, size):
+        self.file = open(path, "wb")
+        self.file.write(InputLog.HEADER.pack(InputLog.MAGIC, InputLog.VERSION, seed, *size))
+
+    def record(self, tick, kind, arg=0, x=0, y=0):
+        self.file.write(InputLog.EVENT.pack(tick, kind, arg, int(x), int(y)))
+
+    def close(self, tick):
+        if self.file.closed:
+            return
+        self.record(tick, END)
+        self.file.close()
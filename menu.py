@@ -0,0 +1,110 @@
+import pygame
+
+from text_cache.textCache import TextCache
+
+
+class Button:
+    """
+    Brown menu button with a black border and a centered white label.
+    Rendered surfaces are shared by every button with the same label and size.
+    """
+    COLOR = (139, 69, 19)
+    HOVER_COLOR = (166, 93, 40)
+    BORDER_COLOR = (0, 0, 0)
+    FONT_SIZE = 64
+    surfaces = {}  # (label, size, hovered) -> Surface
+
+    def __init__(self, label, x, y, width=200, height=80):
+        self.label = label
+        self.rect = pygame.Rect(x, y, width, height)
+
+    def surface(self, hovered):
+        key = (self.label, self.rect.size, hovered)
+        surface = Button.surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(self.rect.size)
+            surface.fill(self.HOVER_COLOR if hovered else self.COLOR)
+            pygame.draw.rect(surface, self.BORDER_COLOR, surface.get_rect(), 3)
+            text = TextCache.render(self.label, self.FONT_SIZE, (255, 255, 255))
+            surface.blit(text, text.get_rect(center=surface.get_rect().center))
+            Button.surfaces[key] = surface
+        return surface
+
+
+def outlined_text(text, size, color, outline_color=(0, 0, 0), width=2):
+    """Render text with a 2px outline (the 8-direction stamp the menus use)."""
+    outline = TextCache.render(text, size, outline_color)
+    inner = TextCache.render(text, size, color)
+    surface = pygame.Surface((inner.get_width() + width * 2, inner.get_height() + width * 2), pygame.SRCALPHA)
+    for dx in (-width, 0, width):
+        for dy in (-width, 0, width):
+            if dx or dy:
+                surface.blit(outline, (width + dx, width + dy))
+    surface.blit(inner, (width, width))
+    return surface
+
+
+class MenuScreen:
+    """
+    A static screen (background, text and buttons) that only redraws when
+    something changes. run() blocks on pygame.event.wait instead of spinning,
+    so an idle menu uses next to no CPU.
+    """
+    def __init__(self, window, background, timeout=500):
+        self.window = window
+        self.background = background
+        self.timeout = timeout  # ms; wake up at least this often even without input
+        self.texts = []    # (surface, pos)
+        self.buttons = []
+        self.keys = {}     # key -> choice
+        self.hovered = None
+
+    def add_text(self, surface, pos):
+        self.texts.append((surface, pos))
+
+    def add_button(self, button):
+        self.buttons.append(button)
+        return button
+
+    def on_key(self, key, choice):
+        self.keys[key] = choice
+
+    def button_at(self, pos):
+        for button in self.buttons:
+            if button.rect.collidepoint(pos):
+                return button
+        return None
+
+    def draw(self):
+        self.window.blit(self.background, (0, 0))
+        for surface, pos in self.texts:
+            self.window.blit(surface, pos)
+        for button in self.buttons:
+            self.window.blit(button.surface(button is self.hovered), button.rect)
+        pygame.display.update()
+
+    def run(self):
+        """
+        Show the screen until a button is clicked or a bound key is pressed.
+        Returns that button's label (or the key's choice), or None if the
+        window was closed.
+        """
+        self.hovered = self.button_at(pygame.mouse.get_pos())
+        self.draw()
+        while True:
+            event = pygame.event.wait(self.timeout)
+            if event.type == pygame.QUIT:
+                return None
+            elif event.type == pygame.KEYDOWN and event.key in self.keys:
+                return self.keys[event.key]
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                button = self.button_at(event.pos)
+                if button:
+                    return button.label
+            elif event.type == pygame.MOUSEMOTION:
+                hovered = self.button_at(event.pos)
+                if hovered is not self.hovered:
+                    self.hovered = hovered
+                    self.draw()
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.draw()
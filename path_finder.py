@@ -3,6 +3,12 @@ from pathfinding.finder.a_star import AStarFinder
 from pathfinding.core.diagonal_movement import DiagonalMovement
 import pygame
 import math
+import heapq
+import hashlib
+import json
+import os
+from collections import OrderedDict, namedtuple
+import numpy as np
 
 
 matrix = [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], 
@@ -36,18 +42,634 @@ matrix = [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
 
 matrix = [[0, 0, 0, 0, 1, 1, 1, 0, 0, 1, 1, 0, 0, 0, 1, 1, 1, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 1, 1, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 0, 0, 0, 1, 0, 0, 0, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 0, 0, 0, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 0, 0, 0, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1, 1, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0], [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0], [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0], [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0], [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1, 1, 0, 0, 1, 1, 1, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 0, 0, 1, 1, 0, 1, 1, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1, 0, 0, 0, 1, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 1, 1, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 1, 0, 0, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], [1, 1, 0, 0, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]] 
 
+# 8-way moves (same as DiagonalMovement.always) with their step costs
+NEIGHBOR_STEPS = [
+    (1, 0, 1), (-1, 0, 1), (0, 1, 1), (0, -1, 1),
+    (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2)),
+]
+
+
+class FlowField:
+    """
+    Distance map towards a single target cell.
+    Built once with a Dijkstra pass over the whole matrix, after that every
+    cell knows its next step towards the target, so following it is O(1).
+    """
+    def __init__(self, matrix, target):
+        self.rows = len(matrix)
+        self.cols = len(matrix[0])
+        self.target = target
+        self.walkable = [matrix[y][x] > 0 for y in range(self.rows) for x in range(self.cols)]
+        self.dist = [math.inf] * (self.rows * self.cols)
+        self.next = [-1] * (self.rows * self.cols)
+        self.build()
+
+    def index(self, x, y):
+        return y * self.cols + x
+
+    def build(self):
+        """Run Dijkstra outwards from the target over the walkable cells."""
+        target_x, target_y = self.target
+        start = self.index(target_x, target_y)
+        self.dist[start] = 0
+        queue = [(0, target_x, target_y)]
+
+        while queue:
+            dist, x, y = heapq.heappop(queue)
+            if dist > self.dist[self.index(x, y)]:
+                continue
+            for dx, dy, cost in NEIGHBOR_STEPS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < self.cols and 0 <= ny < self.rows):
+                    continue
+                i = self.index(nx, ny)
+                if not self.walkable[i]:
+                    continue
+                new_dist = dist + cost
+                if new_dist < self.dist[i]:
+                    self.dist[i] = new_dist
+                    self.next[i] = self.index(x, y)
+                    heapq.heappush(queue, (new_dist, nx, ny))
+
+    def next_step(self, x, y):
+        """Return the next cell towards the target, or None if there is none."""
+        i = self.index(x, y)
+        if self.next[i] != -1:
+            return self.next[i] % self.cols, self.next[i] // self.cols
+        if self.dist[i] == 0:
+            return None
+
+        # Unreached cell (e.g. enemy standing on a blocked tile): step onto the best neighbour
+        best, best_dist = None, math.inf
+        for dx, dy, cost in NEIGHBOR_STEPS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.cols and 0 <= ny < self.rows:
+                if self.dist[self.index(nx, ny)] + cost < best_dist:
+                    best_dist = self.dist[self.index(nx, ny)] + cost
+                    best = (nx, ny)
+        return best
+
+    def path_from(self, x, y):
+        """Follow the field from (x, y) to the target. Returns [] if unreachable."""
+        path = [(x, y)]
+        step = self.next_step(x, y)
+        while step is not None:
+            path.append(step)
+            step = self.next_step(*step)
+        return path if path[-1] == self.target else []
+
+
+class FieldPath:
+    """
+    Route along a shared FlowField from a start cell. Nothing is built up
+    front: the EnemyStore asks the field for the next cell each time the
+    enemy reaches the current one.
+    """
+    def __init__(self, field, start):
+        self.field = field
+        self.start = start
+
+
+class IncrementalField:
+    """
+    Distance map towards every target at once, kept up to date incrementally
+    (LPA* / D* Lite style search run backwards from the targets).
+    Adding or removing a target or flipping a cell only re-expands the cells
+    whose distance actually changes instead of rebuilding the whole map.
+    """
+    def __init__(self, matrix):
+        self.rows = len(matrix)
+        self.cols = len(matrix[0])
+        size = self.rows * self.cols
+        self.walkable = [matrix[y][x] > 0 for y in range(self.rows) for x in range(self.cols)]
+        self.g = [math.inf] * size
+        self.rhs = [math.inf] * size
+        self.owner = [None] * size  # target each cell currently leads to
+        self.goals = {}             # cell index -> target object
+        self.queue = []
+        self.queued = {}            # cell index -> key it was last pushed with
+        self.owner_changed = []     # consistent cells whose owner changed; neighbours still to refresh
+        self.expanded = 0           # cells expanded by the last repair
+
+    def index(self, x, y):
+        return y * self.cols + x
+
+    def neighbors(self, i):
+        x, y = i % self.cols, i // self.cols
+        for dx, dy, cost in NEIGHBOR_STEPS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.cols and 0 <= ny < self.rows:
+                yield self.index(nx, ny), cost
+
+    def update_cell(self, i):
+        """Recompute rhs for one cell and (re)queue it if it became inconsistent."""
+        old_owner = self.owner[i]
+        if i in self.goals:
+            self.rhs[i] = 0
+            self.owner[i] = self.goals[i]
+        elif not self.walkable[i]:
+            self.rhs[i] = math.inf
+            self.owner[i] = None
+        else:
+            best, best_owner = math.inf, None
+            for j, cost in self.neighbors(i):
+                if (self.walkable[j] or j in self.goals) and self.g[j] + cost < best:
+                    best = self.g[j] + cost
+                    best_owner = self.owner[j]
+            self.rhs[i] = best
+            self.owner[i] = best_owner
+
+        if self.g[i] != self.rhs[i]:
+            key = min(self.g[i], self.rhs[i])
+            self.queued[i] = key
+            heapq.heappush(self.queue, (key, i))
+        else:
+            self.queued.pop(i, None)
+            # A queued cell refreshes its neighbours when it is expanded; a
+            # consistent one won't be, so pass a new owner on explicitly
+            if self.owner[i] is not old_owner:
+                self.owner_changed.append(i)
+
+    def update_around(self, i):
+        self.update_cell(i)
+        for j, _ in self.neighbors(i):
+            self.update_cell(j)
+
+    def compute(self):
+        """Expand inconsistent cells until the map is consistent again."""
+        self.expanded = 0
+        while self.queue or self.owner_changed:
+            if not self.queue:
+                # Distances are settled; only owners are still spreading
+                i = self.owner_changed.pop()
+                for j, _ in self.neighbors(i):
+                    self.update_cell(j)
+                continue
+
+            key, i = heapq.heappop(self.queue)
+            if self.queued.get(i) != key:
+                continue  # stale entry
+            del self.queued[i]
+            self.expanded += 1
+
+            if self.g[i] > self.rhs[i]:
+                self.g[i] = self.rhs[i]
+                for j, _ in self.neighbors(i):
+                    self.update_cell(j)
+            else:
+                self.g[i] = math.inf
+                self.update_around(i)
+
+    def add_goal(self, cell, owner):
+        i = self.index(*cell)
+        self.goals[i] = owner
+        self.update_cell(i)
+        self.compute()
+
+    def remove_goal(self, cell):
+        i = self.index(*cell)
+        if i not in self.goals:
+            return
+        del self.goals[i]
+        self.update_cell(i)
+        self.compute()
+
+    def set_walkable(self, x, y, walkable):
+        i = self.index(x, y)
+        if self.walkable[i] == walkable:
+            return
+        self.walkable[i] = walkable
+        self.update_around(i)
+        self.compute()
+
+    def best_neighbor(self, i):
+        best, best_dist = None, math.inf
+        for j, cost in self.neighbors(i):
+            if (self.walkable[j] or j in self.goals) and self.g[j] + cost < best_dist:
+                best_dist = self.g[j] + cost
+                best = j
+        return best, best_dist
+
+    def next_step(self, x, y):
+        """Return the next cell towards the nearest target, or None if there is none."""
+        i = self.index(x, y)
+        if i in self.goals:
+            return None
+        best, _ = self.best_neighbor(i)
+        if best is None:
+            return None
+        return best % self.cols, best // self.cols
+
+    def target_at(self, x, y):
+        """Return (target, distance in cells) that the cell leads to."""
+        i = self.index(x, y)
+        if self.rhs[i] < math.inf:
+            return self.owner[i], self.rhs[i]
+        best, best_dist = self.best_neighbor(i)
+        if best is None:
+            return None, math.inf
+        return self.owner[best], best_dist
+
+    def path_from(self, x, y):
+        """Follow the map from (x, y) to the nearest target. Returns [] if unreachable."""
+        path = [(x, y)]
+        step = self.next_step(x, y)
+        while step is not None:
+            path.append(step)
+            step = self.next_step(*step)
+        return path if self.index(*path[-1]) in self.goals else []
+
+
+# Lightweight stand-in for pathfinding's GridNode: enemies only read .x / .y
+PathPoint = namedtuple("PathPoint", ["x", "y"])
+
+
+class GridPath:
+    """
+    Compact path stored as an (n, 2) int32 array of (x, y) cells.
+    Indexing returns a PathPoint so it can be used anywhere a list of nodes was.
+    """
+    def __init__(self, cells=None):
+        self.cells = cells if cells is not None else np.empty((0, 2), dtype=np.int32)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, i):
+        x, y = self.cells[i]
+        return PathPoint(int(x), int(y))
+
+    def __iter__(self):
+        for x, y in self.cells.tolist():
+            yield PathPoint(x, y)
+
+
+class ArrayGrid:
+    """
+    Array-backed walkability grid with an A* that reuses preallocated buffers.
+    The grid is padded with a blocked border so neighbour lookups need no bounds
+    checks, and every search stamps the cells it touches instead of clearing
+    the buffers, so there is no cleanup() between searches.
+    """
+    STRAIGHT = 10
+    DIAGONAL = 14
+
+    def __init__(self, matrix):
+        self.rows = len(matrix)
+        self.cols = len(matrix[0])
+        self.width = self.cols + 2  # padded row length
+        size = (self.rows + 2) * self.width
+
+        self.walkable = np.zeros((self.rows + 2, self.width), dtype=np.uint8)
+        self.walkable[1:-1, 1:-1] = np.array(matrix) > 0
+        self.walkable = self.walkable.reshape(-1)
+        self.g = np.zeros(size, dtype=np.int32)
+        self.parent = np.full(size, -1, dtype=np.int32)
+        self.seen = np.zeros(size, dtype=np.int32)    # search id that last touched the cell
+        self.closed = np.zeros(size, dtype=np.int32)  # search id that last closed the cell
+        self.search_id = 0
+
+        w = self.width
+        self.steps = [
+            (1, self.STRAIGHT), (-1, self.STRAIGHT), (w, self.STRAIGHT), (-w, self.STRAIGHT),
+            (w + 1, self.DIAGONAL), (w - 1, self.DIAGONAL), (-w + 1, self.DIAGONAL), (-w - 1, self.DIAGONAL),
+        ]
+
+    def index(self, x, y):
+        return (y + 1) * self.width + (x + 1)
+
+    def set_walkable(self, x, y, walkable):
+        self.walkable[self.index(x, y)] = 1 if walkable else 0
+
+    def find_path(self, start, end):
+        """A* from start to end cell (8-way). Returns a GridPath, empty if unreachable."""
+        self.search_id += 1
+        search_id = self.search_id
+        w = self.width
+
+        # memoryviews give plain int reads/writes without numpy scalar overhead
+        walkable = memoryview(self.walkable)
+        g = memoryview(self.g)
+        parent = memoryview(self.parent)
+        seen = memoryview(self.seen)
+        closed = memoryview(self.closed)
+
+        start_i = self.index(*start)
+        goal_i = self.index(*end)
+        goal_x, goal_y = end[0] + 1, end[1] + 1
+
+        def heuristic(i):
+            dx = abs(i % w - goal_x)
+            dy = abs(i // w - goal_y)
+            return self.STRAIGHT * max(dx, dy) + (self.DIAGONAL - self.STRAIGHT) * min(dx, dy)
+
+        g[start_i] = 0
+        parent[start_i] = -1
+        seen[start_i] = search_id
+        queue = [(heuristic(start_i), start_i)]
+
+        while queue:
+            _, i = heapq.heappop(queue)
+            if closed[i] == search_id:
+                continue
+            closed[i] = search_id
+            if i == goal_i:
+                return self.build_path(goal_i)
+
+            gi = g[i]
+            for offset, cost in self.steps:
+                j = i + offset
+                if not walkable[j] and j != goal_i:
+                    continue
+                if closed[j] == search_id:
+                    continue
+                new_g = gi + cost
+                if seen[j] != search_id or new_g < g[j]:
+                    seen[j] = search_id
+                    g[j] = new_g
+                    parent[j] = i
+                    heapq.heappush(queue, (new_g + heuristic(j), j))
+
+        return GridPath()
+
+    def build_path(self, goal_i):
+        indices = []
+        i = goal_i
+        while i != -1:
+            indices.append(i)
+            i = int(self.parent[i])
+        indices = np.array(indices[::-1], dtype=np.int32)
+        cells = np.empty((len(indices), 2), dtype=np.int32)
+        cells[:, 0] = indices % self.width - 1
+        cells[:, 1] = indices // self.width - 1
+        return GridPath(cells)
+
+
+class HierarchicalGrid:
+    """
+    HPA* over the matrix for large maps.
+    The grid is split into square clusters; entrances are placed on the
+    walkable openings between neighbouring clusters (including diagonal steps
+    across a corner where four clusters meet) and every entrance's distances
+    to the cells of its cluster are precomputed. A query hooks start and end
+    onto their clusters' entrances from those tables, searches the small graph
+    of entrances and only then unwinds the cluster-local segments the route
+    uses, so a query never searches the grid itself unless an endpoint is a
+    blocked cell (e.g. a tower).
+    """
+    LONG_ENTRANCE = 6  # openings at least this wide get an entrance at each end
+
+    def __init__(self, matrix, cluster_size=10):
+        self.rows = len(matrix)
+        self.cols = len(matrix[0])
+        self.cluster_size = cluster_size
+        self.walkable = [matrix[y][x] > 0 for y in range(self.rows) for x in range(self.cols)]
+
+        self.edges = {}     # entrance cell -> {neighbour cell: cost}
+        self.clusters = {}  # cluster -> entrance cells inside it
+        self.hooks = {}     # entrance cell -> (dist, parent) of a search over its cluster
+        self.build()
+
+    def is_walkable(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows and self.walkable[y * self.cols + x]
+
+    def cluster_of(self, cell):
+        return cell[0] // self.cluster_size, cell[1] // self.cluster_size
+
+    def cluster_bounds(self, cluster):
+        x0, y0 = cluster[0] * self.cluster_size, cluster[1] * self.cluster_size
+        return x0, y0, min(x0 + self.cluster_size, self.cols), min(y0 + self.cluster_size, self.rows)
+
+    def add_entrance(self, a, b, cost=1):
+        """Connect two adjacent cells on either side of a cluster border."""
+        for cell in (a, b):
+            if cell not in self.edges:
+                self.edges[cell] = {}
+                self.clusters.setdefault(self.cluster_of(cell), []).append(cell)
+        self.edges[a][b] = cost
+        self.edges[b][a] = cost
+
+    def add_openings(self, pairs):
+        """Turn runs of open border pairs into one or two entrances."""
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and self.is_walkable(*a) and self.is_walkable(*b):
+                run.append((a, b))
+                continue
+            if run:
+                if len(run) >= self.LONG_ENTRANCE:
+                    self.add_entrance(*run[0])
+                    self.add_entrance(*run[-1])
+                else:
+                    self.add_entrance(*run[len(run) // 2])
+                run = []
+
+        # Diagonal-only crossings, where neither cell has a straight opening
+        straight = {cell for pair in pairs if self.is_walkable(*pair[0]) and self.is_walkable(*pair[1]) for cell in pair}
+        for i in range(len(pairs) - 1):
+            (a0, b0), (a1, b1) = pairs[i], pairs[i + 1]
+            for a, b in ((a0, b1), (a1, b0)):
+                if a in straight or b in straight:
+                    continue
+                if self.is_walkable(*a) and self.is_walkable(*b):
+                    self.add_entrance(a, b, math.sqrt(2))
+
+    def build(self):
+        size = self.cluster_size
+        # Vertical borders (between horizontally adjacent clusters)
+        for x in range(size, self.cols, size):
+            for y0 in range(0, self.rows, size):
+                pairs = [((x - 1, y), (x, y)) for y in range(y0, min(y0 + size, self.rows))]
+                self.add_openings(pairs)
+        # Horizontal borders
+        for y in range(size, self.rows, size):
+            for x0 in range(0, self.cols, size):
+                pairs = [((x, y - 1), (x, y)) for x in range(x0, min(x0 + size, self.cols))]
+                self.add_openings(pairs)
+        # Corners, where a diagonal step crosses into the diagonally adjacent cluster
+        for x in range(size, self.cols, size):
+            for y in range(size, self.rows, size):
+                for a, b in (((x - 1, y - 1), (x, y)), ((x, y - 1), (x - 1, y))):
+                    if self.is_walkable(*a) and self.is_walkable(*b):
+                        self.add_entrance(a, b, math.sqrt(2))
+
+        # Intra-cluster costs between every pair of entrances in a cluster;
+        # the searches are kept to hook queries on and to refine routes
+        for cluster, entrances in self.clusters.items():
+            for a in entrances:
+                dist, parent = self.local_search(a, cluster)
+                self.hooks[a] = (dist, parent)
+                for b in entrances:
+                    if b != a and b in dist:
+                        self.edges[a][b] = dist[b]
+
+    def local_search(self, source, cluster, goal=None):
+        """Dijkstra from source that never leaves the cluster. Returns (dist, parent)."""
+        x0, y0, x1, y1 = self.cluster_bounds(cluster)
+        dist = {source: 0}
+        parent = {source: None}
+        queue = [(0, source)]
+        while queue:
+            d, cell = heapq.heappop(queue)
+            if d > dist[cell]:
+                continue
+            if cell == goal:
+                break
+            x, y = cell
+            for dx, dy, cost in NEIGHBOR_STEPS:
+                nx, ny = x + dx, y + dy
+                if not (x0 <= nx < x1 and y0 <= ny < y1):
+                    continue
+                if not self.walkable[ny * self.cols + nx] and (nx, ny) != goal:
+                    continue
+                new_d = d + cost
+                if new_d < dist.get((nx, ny), math.inf):
+                    dist[(nx, ny)] = new_d
+                    parent[(nx, ny)] = cell
+                    heapq.heappush(queue, (new_d, (nx, ny)))
+        return dist, parent
+
+    @staticmethod
+    def unwind(parent, cell):
+        cells = []
+        while cell is not None:
+            cells.append(cell)
+            cell = parent[cell]
+        return cells[::-1]
+
+    def hook(self, cell, cluster):
+        """
+        Return ({entrance: cost}, route) linking a cell to its cluster's
+        entrances; route(entrance) gives the cells from the cell to it.
+        """
+        entrances = self.clusters.get(cluster, [])
+        if self.is_walkable(*cell):
+            # Moves cost the same both ways, so the entrances' own searches already hold the answer
+            costs = {}
+            for e in entrances:
+                dist = self.hooks[e][0]
+                if cell in dist:
+                    costs[e] = dist[cell]
+            return costs, lambda e: self.unwind(self.hooks[e][1], cell)[::-1]
+        dist, parent = self.local_search(cell, cluster)
+        return {e: dist[e] for e in entrances if e in dist}, lambda e: self.unwind(parent, e)
+
+    def find_path(self, start, end):
+        """Return a GridPath from start to end, empty if unreachable."""
+        start_cluster = self.cluster_of(start)
+        end_cluster = self.cluster_of(end)
+
+        if start_cluster == end_cluster:
+            dist, parent = self.local_search(start, start_cluster, goal=end)
+            if end in dist:
+                return self.to_grid_path(self.unwind(parent, end))
+
+        # Hook start and end onto the entrances of their clusters
+        start_links, start_route = self.hook(start, start_cluster)
+        end_links, end_route = self.hook(end, end_cluster)
+
+        # A* over the abstract graph of entrances; came_from also records how
+        # each node was reached so the route can be refined afterwards
+        ex, ey = end
+        diagonal = math.sqrt(2) - 1
+        edges = self.edges
+        g = {start: 0}
+        came_from = {start: None}
+        queue = [(0, start)]
+        for e, cost in start_links.items():
+            if cost < g.get(e, math.inf):
+                g[e] = cost
+                came_from[e] = start
+                dx, dy = abs(e[0] - ex), abs(e[1] - ey)
+                heapq.heappush(queue, (cost + (dx + diagonal * dy if dx > dy else dy + diagonal * dx), e))
+        closed = set()
+        while queue:
+            _, node = heapq.heappop(queue)
+            if node in closed:
+                continue
+            closed.add(node)
+            if node == end:
+                break
+
+            node_g = g[node]
+            links = edges.get(node, {}).items()
+            if node in end_links:
+                links = list(links) + [(end, end_links[node])]
+            for neighbour, cost in links:
+                new_g = node_g + cost
+                if new_g < g.get(neighbour, math.inf):
+                    g[neighbour] = new_g
+                    came_from[neighbour] = node
+                    dx, dy = abs(neighbour[0] - ex), abs(neighbour[1] - ey)
+                    heapq.heappush(queue, (new_g + (dx + diagonal * dy if dx > dy else dy + diagonal * dx), neighbour))
+
+        if end not in came_from:
+            return GridPath()
+
+        # Refine only the abstract edges on the chosen route
+        route = [end]
+        while came_from[route[-1]] is not None:
+            route.append(came_from[route[-1]])
+        route.reverse()
+
+        cells = [start]
+        for a, b in zip(route, route[1:]):
+            if self.cluster_of(a) != self.cluster_of(b):
+                cells.append(b)  # a step across a border
+            elif a == start:
+                cells.extend(start_route(b)[1:])
+            elif b == end:
+                cells.extend(end_route(a)[::-1][1:])
+            else:
+                cells.extend(self.unwind(self.hooks[a][1], b)[1:])
+        return self.to_grid_path(cells)
+
+    @staticmethod
+    def to_grid_path(cells):
+        return GridPath(np.array(cells, dtype=np.int32).reshape(-1, 2))
+
+
 class Pathfinder:
     def __init__(
             self, 
             matrix, 
             cell_width, 
-            cell_height
+            cell_height,
+            mode="astar",
+            cache_size=256,
+            spawn_points=None,
+            route_target=None,
+            route_cache_dir=None
         ):
         self.matrix = matrix
         self.grid = Grid(matrix=matrix)
         self.cell_width = cell_width
         self.cell_height = cell_height
 
+        # "astar": search per enemy, "flow_field": one distance map per target,
+        # "incremental": one shared distance map repaired on tower changes,
+        # "array": A* over the numpy-backed ArrayGrid,
+        # "hpa": hierarchical A* over clusters, for large maps
+        self.mode = mode
+        self.flow_fields = {}
+        self.target_cells = {}
+        self.incremental = IncrementalField(matrix) if mode == "incremental" else None
+        self.array_grid = ArrayGrid(matrix) if mode == "array" else None
+        self.hierarchy = HierarchicalGrid(matrix) if mode == "hpa" else None
+
+        # LRU cache of finished paths keyed by (start cell, end cell); the hit/miss
+        # counters also count flow-field lookups (see cache_stats)
+        self.cache_size = cache_size
+        self.path_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Fixed spawn -> main tower routes, solved once at startup
+        # (the incremental map has no targets yet at this point)
+        self.routes = {}
+        if spawn_points and route_target and mode != "incremental":
+            self.build_routes(spawn_points, route_target, route_cache_dir)
+
         self.path = []
         self.enemy = None
         self.target = None
@@ -59,23 +681,199 @@ class Pathfinder:
     def create_path(self):
         # the enemy position
         if not self.enemy or not self.target: return
-        
-        start_x, start_y = self.enemy.sprite.get_coord(self.cell_width, self.cell_height)
-        start_x = max(0, min(start_x, len(self.grid.nodes[0]) - 1))
-        start_y = max(0, min(start_y, len(self.grid.nodes) - 1))
 
-        start = self.grid.node(start_x, start_y)
+        start, end = self.get_cells(self.enemy.sprite, self.target.sprite)
+        self.path = self.find_path(start, end)
+        return self.path
+        #self.enemy.sprite.set_path(self.path)
+
+    def get_cells(self, enemy, target):
+        """Return the (start, end) grid cells for an enemy walking to a target."""
+        start = self.clamp(enemy.get_coord(self.cell_width, self.cell_height))
 
         # the nereast tower/artillery position
-        end_x, end_y = self.target.sprite.get_coord(self.cell_width, self.cell_height)
-        end = self.grid.node(end_x, end_y)
+        end = target.get_coord(self.cell_width, self.cell_height)
+        return start, end
+
+    def find_path(self, start, end):
+        """Return the path between two cells, from the cache when possible."""
+        path = self.cached_path(start, end)
+        if path is None:
+            path = self.solve(start, end)
+            self.store_path(start, end, path)
+        return path
+
+    def cached_path(self, start, end):
+        """Return the cached path for (start, end) or None, counting hits/misses."""
+        key = (start, end)
+        if key in self.routes:
+            self.cache_hits += 1
+            return self.routes[key]
+        if key in self.path_cache:
+            self.path_cache.move_to_end(key)
+            self.cache_hits += 1
+            return self.path_cache[key]
+        self.cache_misses += 1
+        return None
+
+    def store_path(self, start, end, path):
+        self.path_cache[(start, end)] = path
+        if len(self.path_cache) > self.cache_size:
+            self.path_cache.popitem(last=False)
+
+    def clamp(self, cell):
+        x = max(0, min(cell[0], len(self.grid.nodes[0]) - 1))
+        y = max(0, min(cell[1], len(self.grid.nodes) - 1))
+        return x, y
+
+    def matrix_hash(self):
+        return hashlib.sha1(json.dumps(self.matrix).encode()).hexdigest()
+
+    def build_routes(self, spawn_points, target, cache_dir=None):
+        """
+        Solve the route from every spawn cell to the target once. With a
+        cache_dir the table is saved to disk under the mode, the target and a
+        hash of the matrix, and reused on later launches. The disk cache is
+        best-effort: if it can't be read or written the table just lives in
+        memory.
+        """
+        starts = sorted({self.clamp(cell) for cell in spawn_points})
+        target = tuple(target)
+
+        cache_file = None
+        if cache_dir:
+            name = f"routes_{self.mode}_{target[0]}_{target[1]}_{self.matrix_hash()}.json"
+            cache_file = os.path.join(cache_dir, name)
+            paths = self.read_routes(cache_file, starts, target)
+            if paths is not None:
+                for start, cells in zip(starts, paths):
+                    self.routes[(start, target)] = [PathPoint(x, y) for x, y in cells]
+                return
+
+        for start in starts:
+            path = self.solve(start, target)
+            self.routes[(start, target)] = [PathPoint(point.x, point.y) for point in path]
+
+        if cache_file:
+            self.write_routes(cache_file, starts, target)
+
+    @staticmethod
+    def read_routes(cache_file, starts, target):
+        """Return the cached paths for starts -> target, or None if missing, stale or unreadable."""
+        try:
+            with open(cache_file) as f:
+                data = json.load(f)
+            if data["target"] != list(target) or data["starts"] != [list(s) for s in starts]:
+                return None
+            paths = [[(int(x), int(y)) for x, y in cells] for cells in data["paths"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if len(paths) != len(starts):
+            return None
+        return paths
+
+    def write_routes(self, cache_file, starts, target):
+        # Write then rename so a crash never leaves a half-written entry
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file + ".tmp", "w") as f:
+                json.dump({
+                    "target": list(target),
+                    "starts": [list(s) for s in starts],
+                    "paths": [[[p.x, p.y] for p in self.routes[(s, target)]] for s in starts]
+                }, f)
+            os.replace(cache_file + ".tmp", cache_file)
+        except OSError:
+            # Read-only checkout, full disk...: keep the table in memory only
+            try:
+                os.remove(cache_file + ".tmp")
+            except OSError:
+                pass
+
+    def route_for(self, enemy, target):
+        """Return the precomputed route for an enemy standing on a spawn cell, or None."""
+        return self.routes.get(self.get_cells(enemy, target))
+
+    def solve(self, start, end):
+        """Run the configured engine for (start, end), bypassing the cache."""
+        if self.mode == "flow_field":
+            field = self.get_flow_field(end)
+            return [self.grid.node(x, y) for x, y in field.path_from(*start)]
+        if self.mode == "incremental":
+            return [self.grid.node(x, y) for x, y in self.incremental.path_from(*start)]
+        if self.mode == "array":
+            return self.array_grid.find_path(start, end)
+        if self.mode == "hpa":
+            return self.hierarchy.find_path(start, end)
 
         finder = AStarFinder(diagonal_movement=DiagonalMovement.always)
-        self.path, _ = finder.find_path(start, end, self.grid)
+        path, _ = finder.find_path(self.grid.node(*start), self.grid.node(*end), self.grid)
         self.grid.cleanup()
+        return path
 
-        return self.path
-        #self.enemy.sprite.set_path(self.path)
+    def field_path(self, start, end):
+        """Flow-field mode: a FieldPath from start along the shared field for end."""
+        return FieldPath(self.get_flow_field(end), start)
+
+    def get_flow_field(self, target):
+        """Return the flow field for a target cell, building it on first use (a cache miss)."""
+        field = self.flow_fields.get(target)
+        if field is None:
+            self.cache_misses += 1
+            field = FlowField(self.matrix, target)
+            self.flow_fields[target] = field
+        else:
+            self.cache_hits += 1
+        return field
+
+    def invalidate(self):
+        """Drop every cached path, route and flow field, e.g. after the map itself changes."""
+        self.path_cache.clear()
+        self.routes.clear()
+        self.flow_fields.clear()
+
+    def add_target(self, target):
+        """Register a tower enemies can walk to."""
+        cell = target.get_coord(self.cell_width, self.cell_height)
+        self.target_cells[target] = cell
+        self.path_cache.clear()
+        if self.incremental:
+            self.incremental.add_goal(cell, target)
+
+    def remove_target(self, target):
+        """Forget a destroyed tower; only the routes that led to it are repaired."""
+        cell = self.target_cells.pop(target, None)
+        if cell is None:
+            return
+        self.path_cache.clear()
+        # Another tower may share the cell, in which case it stays a target
+        remaining = [t for t, c in self.target_cells.items() if c == cell]
+        if not remaining:
+            self.flow_fields.pop(cell, None)
+        if self.incremental:
+            if remaining:
+                self.incremental.add_goal(cell, remaining[0])
+            else:
+                self.incremental.remove_goal(cell)
+
+    def clear_targets(self):
+        """Forget every tower, e.g. for a new game. Routes and flow fields only depend on the map, so they stay."""
+        self.target_cells.clear()
+        self.path_cache.clear()
+        if self.incremental:
+            self.incremental = IncrementalField(self.matrix)
+
+    def target_for(self, enemy):
+        """Return (tower, distance in cells) the enemy's cell leads to (incremental mode)."""
+        x, y = self.clamp(enemy.get_coord(self.cell_width, self.cell_height))
+        return self.incremental.target_at(x, y)
+
+    def cache_stats(self):
+        """
+        Return (hits, misses, entries) for the path cache, counting flow-field
+        lookups as well: in flow_field mode a repath is a field lookup.
+        """
+        return self.cache_hits, self.cache_misses, len(self.path_cache) + len(self.flow_fields)
 
     def draw_collision_rects(self, win):
         """Draw the collision rectangles of the path nodes on the window."""
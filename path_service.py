@@ -0,0 +1,270 @@
+import sys
+import math
+import time
+import heapq
+import traceback
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from path_finder import Pathfinder, PathPoint
+
+
+# Each worker (thread or process) owns its own Pathfinder, so searches never
+# share grid state with the render thread or with each other.
+_worker = threading.local()
+
+
+def _init_worker(matrix, mode):
+    _worker.pathfinder = Pathfinder(matrix, 1, 1, mode=mode, cache_size=0)
+
+
+def _solve_path(start, end):
+    """Runs on a worker. Returns the path as plain (x, y) tuples so it pickles cheaply."""
+    return [(point.x, point.y) for point in _worker.pathfinder.solve(start, end)]
+
+
+class PathService:
+    """
+    Solves path requests on a worker pool and hands the results to the enemies
+    on a later frame. Enemies keep following their current path until the new
+    one arrives, so the game loop never waits on a search.
+    With workers=0 every request is solved right away on the calling thread,
+    which keeps headless runs deterministic. The pool is only started by the
+    first search that needs it, so modes that answer everything on the main
+    thread (flow_field, incremental) never start one.
+    """
+    def __init__(self, pathfinder, workers=2, use_processes=False):
+        self.pathfinder = pathfinder
+        self.pending = {}  # enemy -> (target, start, end, future)
+        self.workers = workers
+        self.use_processes = use_processes
+        self.executor = None
+
+    def pool(self):
+        """Return the worker pool, starting it on first use."""
+        if self.executor is None:
+            initargs = (self.pathfinder.matrix, self.pathfinder.mode)
+            if self.use_processes:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=initargs
+                )
+            else:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=initargs
+                )
+        return self.executor
+
+    def request(self, enemy, target):
+        """Ask for a new path from the enemy to the target. Never blocks."""
+        if target is None:
+            return
+
+        # A newer request replaces any search still running for this enemy
+        self.cancel(enemy)
+
+        start, end = self.pathfinder.get_cells(enemy, target)
+        if self.pathfinder.mode == "flow_field":
+            # Enemies step along the target's shared field; there is no path to search for
+            self.attach(enemy, target, self.pathfinder.field_path(start, end))
+            return
+
+        path = self.pathfinder.cached_path(start, end)
+        if path is None and (self.workers == 0 or self.pathfinder.mode == "incremental"):
+            # The shared incremental map lives on the main thread and is cheap to follow
+            path = self.pathfinder.find_path(start, end)
+        if path is not None:
+            self.attach(enemy, target, path)
+            return
+
+        future = self.pool().submit(_solve_path, start, end)
+        self.pending[enemy] = (target, start, end, future)
+
+    def deliver(self):
+        """
+        Attach every finished path to its enemy. Call once per frame.
+        Returns the enemies whose search failed, to be retried.
+        """
+        failed = []
+        for enemy, (target, start, end, future) in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[enemy]
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                print(f"Path search {start} -> {end} failed:", file=sys.stderr)
+                traceback.print_exception(error)
+                failed.append(enemy)
+                continue
+            path = [PathPoint(x, y) for x, y in future.result()]
+            self.pathfinder.store_path(start, end, path)
+            self.attach(enemy, target, path)
+        return failed
+
+    def attach(self, enemy, target, path):
+        enemy.path = path
+        enemy.nearest_target = target
+
+    def is_pending(self, enemy):
+        return enemy in self.pending
+
+    def cancel(self, enemy):
+        request = self.pending.pop(enemy, None)
+        if request:
+            request[3].cancel()
+
+    def cancel_all(self):
+        for enemy in list(self.pending):
+            self.cancel(enemy)
+
+    def shutdown(self):
+        self.cancel_all()
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+
+class RepathScheduler:
+    """
+    Spreads repath work across frames instead of repathing every enemy at once.
+    Each frame it repaths the most urgent enemies until the millisecond budget
+    is spent: first those whose target died or whose path ran out short of it,
+    then those who were never given a path or whose path is older than the
+    interval, oldest first. budget_ms=None repaths everything that is due (no
+    wall-clock dependence, for headless runs).
+
+    Nothing is scanned per frame: enemies join with track(), urgent ones are
+    reported through target_lost() and path_ended(), and the rest wait in a
+    heap keyed on last_repath.
+    """
+    def __init__(self, interval=2000, budget_ms=2.0):
+        self.interval = interval
+        self.budget_ms = budget_ms
+        self.expired_at = None  # paths older than this are due regardless of age
+
+        self.urgent = {}        # enemy -> None, an ordered set
+        self.queue = []         # heap of (last_repath, n, enemy); stale entries are skipped
+        self.pushed = 0         # tie-breaker so enemies themselves never get compared
+
+        # How far behind the scheduler is after the last frame
+        self.backlog = 0        # enemies still due
+        self.worst_age = 0      # age in ms of the oldest path still due
+
+    def track(self, enemy):
+        """Start scheduling a freshly spawned enemy (never repathed: due right away)."""
+        self.push(enemy)
+
+    def push(self, enemy):
+        heapq.heappush(self.queue, (self.key(enemy), self.pushed, enemy))
+        self.pushed += 1
+
+    @staticmethod
+    def key(enemy):
+        return enemy.last_repath if enemy.last_repath is not None else -math.inf
+
+    def live(self, entry):
+        """False for the heap entries of dead enemies and of paths replaced since."""
+        last, _, enemy = entry
+        return enemy.life > 0 and last == self.key(enemy)
+
+    def expire(self, current_time):
+        """Mark every current path as due, e.g. after a tower is placed."""
+        self.expired_at = current_time
+
+    def retry(self, enemies):
+        """Put enemies whose repath failed back at the front, like enemies never given a path."""
+        for enemy in enemies:
+            enemy.last_repath = None
+            self.push(enemy)
+
+    def target_lost(self, enemies):
+        """The enemies' target died: repath them before anyone else."""
+        for enemy in enemies:
+            self.urgent[enemy] = None
+
+    def path_ended(self, enemies):
+        """
+        The enemies' paths ran out (or came back empty). Those that didn't end
+        up next to a live target are stuck and get repathed before anyone else.
+        """
+        for enemy in enemies:
+            if not self.at_target(enemy):
+                self.urgent[enemy] = None
+
+    @staticmethod
+    def at_target(enemy):
+        target = enemy.nearest_target
+        if target is None or target.life <= 0:
+            return False
+        x, y = enemy.get_coord(enemy.cell_width, enemy.cell_height)
+        target_x, target_y = target.get_coord(enemy.cell_width, enemy.cell_height)
+        return abs(x - target_x) <= 1 and abs(y - target_y) <= 1
+
+    def due(self, last, current_time):
+        if current_time - last >= self.interval:
+            return True
+        return self.expired_at is not None and last < self.expired_at
+
+    def run(self, current_time, repath, is_pending=None):
+        """
+        Call repath(enemy) for due enemies until this frame's budget is used.
+        Enemies for which is_pending(enemy) is True are left alone until their
+        previous request has been answered.
+        """
+        deadline = None if self.budget_ms is None else time.perf_counter() + self.budget_ms / 1000
+        done = 0
+        waiting = []  # pending enemies popped off the heap, put back afterwards
+
+        def over_budget():
+            # Always make some progress, even if one repath blows the budget
+            return done and deadline is not None and time.perf_counter() >= deadline
+
+        for enemy in list(self.urgent):
+            if over_budget():
+                break
+            if enemy.life <= 0:
+                del self.urgent[enemy]
+                continue
+            if is_pending and is_pending(enemy):
+                continue
+            del self.urgent[enemy]
+            repath(enemy)
+            enemy.last_repath = current_time
+            self.push(enemy)
+            done += 1
+
+        queue = self.queue
+        while queue and not over_budget():
+            if not self.due(queue[0][0], current_time):
+                break
+            entry = heapq.heappop(queue)
+            if not self.live(entry):
+                continue
+            enemy = entry[2]
+            if is_pending and is_pending(enemy):
+                waiting.append(enemy)
+                continue
+            repath(enemy)
+            enemy.last_repath = current_time
+            self.push(enemy)
+            done += 1
+        for enemy in waiting:
+            self.push(enemy)
+
+        # Only walks the heap when the budget ran out with paths still due
+        left = []
+        if over_budget() and queue and self.due(queue[0][0], current_time):
+            left = [entry[0] for entry in queue if self.due(entry[0], current_time) and self.live(entry)]
+        self.backlog = len(self.urgent) + len(left)
+        self.worst_age = max((current_time - last for last in left if last != -math.inf), default=0)
+
+    def lag_stats(self):
+        """Return (enemies still due, ms the oldest due path is past the interval)."""
+        return self.backlog, max(0, self.worst_age - self.interval)
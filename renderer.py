@@ -0,0 +1,107 @@
+import pygame
+
+
+def area_key(area):
+    return None if area is None else tuple(pygame.Rect(area))
+
+
+class TrackedSurface(pygame.Surface):
+    """
+    Off-screen canvas that remembers the area and content of every blit and
+    fill: drawn holds (rect, what) pairs, what being (source surface, area,
+    flags) for a blit and (mapped color, flags) for a fill.
+    pygame.draw calls are not tracked, so filled shapes should use fill() and
+    outlines should stay inside something that was blitted or filled. Sources
+    are told apart by identity, so a surface must not be redrawn in place
+    while it is on screen (TextCache and the sprite frames never are).
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.drawn = []
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        rect = super().blit(source, dest, area, special_flags)
+        self.drawn.append((rect, (source, area_key(area), special_flags)))
+        return rect
+
+    def blits(self, blit_sequence, doreturn=True):
+        blit_sequence = list(blit_sequence)
+        rects = super().blits(blit_sequence, doreturn=True)
+        for rect, (source, _, *rest) in zip(rects, blit_sequence):
+            area = rest[0] if rest else None
+            flags = rest[1] if len(rest) > 1 else 0
+            self.drawn.append((rect, (source, area_key(area), flags)))
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        rect = super().fill(color, rect, special_flags)
+        self.drawn.append((rect, (self.map_rgb(color), special_flags)))
+        return rect
+
+    def restore(self, background, rects):
+        """Copy the background back over rects without recording them."""
+        for rect in rects:
+            pygame.Surface.blit(self, background, rect, rect)
+
+
+class DirtyRenderer:
+    """
+    Dirty-rectangle renderer for the game screen.
+    The game draws onto canvas every frame as usual; the renderer only puts the
+    background back under what was drawn last frame. Only the regions that
+    changed are pushed to the display: draws that weren't made last frame with
+    the same rect and source (something moved, changed frame or text) and the
+    rects of last frame's draws that are gone (what they vacated).
+    When that area is more than full_redraw_ratio of the screen, one full
+    blit and display update is cheaper than many small ones.
+    """
+    def __init__(self, display, background, full_redraw_ratio=0.5):
+        self.display = display
+        self.background = background
+        self.full_redraw_ratio = full_redraw_ratio
+        self.screen_rect = display.get_rect()
+        self.canvas = TrackedSurface(display.get_size(), 0, display)
+        self.previous = []           # rects drawn last frame, to clear from the canvas
+        self.previous_draws = set()  # (rect, what) drawn last frame, to compare with
+        self.full_redraw = True
+        self.full_redraws = 0  # how many frames fell back, for tuning
+
+    def invalidate(self):
+        """Redraw everything next frame, e.g. after a menu drew over the screen."""
+        self.full_redraw = True
+
+    def begin(self):
+        """Clear last frame's drawings and return the canvas to draw this frame on."""
+        canvas = self.canvas
+        if self.full_redraw:
+            pygame.Surface.blit(canvas, self.background, (0, 0))
+        else:
+            canvas.restore(self.background, self.previous)
+        canvas.drawn = []
+        return canvas
+
+    def end(self):
+        """Push the changed regions of the canvas to the display."""
+        screen = self.screen_rect
+        draws = set()
+        for rect, what in self.canvas.drawn:
+            rect = rect.clip(screen)
+            if rect.width and rect.height:
+                draws.add((tuple(rect), what))
+        dirty = [pygame.Rect(rect) for rect in {rect for rect, _ in draws ^ self.previous_draws}]
+        self.previous = [pygame.Rect(rect) for rect, _ in draws]
+        self.previous_draws = draws
+
+        dirty_area = sum(rect.width * rect.height for rect in dirty)
+        if self.full_redraw or dirty_area > self.full_redraw_ratio * screen.width * screen.height:
+            self.display.blit(self.canvas, (0, 0))
+            pygame.display.update()
+            self.full_redraw = False
+            self.full_redraws += 1
+            return
+
+        if not dirty:
+            return
+        for rect in dirty:
+            self.display.blit(self.canvas, rect, rect)
+        pygame.display.update(dirty)
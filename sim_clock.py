@@ -0,0 +1,52 @@
+import time
+
+# Enemy, arrow and animation speeds are tuned per tick at this rate
+TICK_RATE = 30
+TICK_MS = 1000 / TICK_RATE
+
+
+class SimClock:
+    """
+    Simulation time, decoupled from wall-clock time and from the frame rate.
+    Real time is collected in an accumulator and paid out as fixed steps of
+    step_ms, so the game advances the same way at 20 or 144 fps. alpha is how
+    far the accumulator is into the next step, for interpolating the render.
+    time_scale > 1 runs the simulation faster than real time.
+    """
+    def __init__(self, step_ms=TICK_MS, max_steps=5, time_scale=1.0):
+        self.step_ms = step_ms
+        self.max_steps = max_steps  # per frame, so a slow frame can't snowball
+        self.time_scale = time_scale
+        self.now = 0.0          # simulation time in ms
+        self.accumulator = 0.0
+        self.last_real = time.perf_counter()
+
+    def reset(self):
+        """Forget the real time since the last frame, e.g. after a menu."""
+        self.last_real = time.perf_counter()
+        self.accumulator = 0.0
+
+    def advance(self):
+        """Add the real time since the last call and return how many steps are due."""
+        real = time.perf_counter()
+        self.accumulator += (real - self.last_real) * 1000 * self.time_scale
+        self.last_real = real
+
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            # Too far behind: drop the backlog instead of trying to catch up
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_ms
+        return steps
+
+    def step(self, dt=None):
+        """Move simulation time forward one step (or dt ms) and return it."""
+        self.now += self.step_ms if dt is None else dt
+        return self.now
+
+    @property
+    def alpha(self):
+        """0..1, how far rendering is between the last step and the next one."""
+        return min(self.accumulator / self.step_ms, 1.0)
@@ -1,12 +1,168 @@
+import os
+import struct
+import hashlib
+
 import pygame
 
 class SpriteHandler:
+    """
+    Central asset loader. Every surface it hands out is already in the display's
+    pixel format (convert_alpha when the image uses transparency, convert
+    otherwise), so blits don't pay a per-pixel conversion each frame.
+    Images loaded at their original size are kept per path and shared; scaled
+    sprites are new surfaces, converted after scaling.
+
+    With cache_dir set, scaled sprites are also written to disk as raw pixels,
+    one folder per display resolution, and later launches read them back
+    instead of decoding and scaling the full-size PNGs again.
+
+    In headless mode nothing is decoded: every image is a blank stand-in of
+    the right size, so rects and hitboxes still match the real game.
+    """
+    images = {}
+    cache_dir = None
+    headless = False
+    stand_ins = {}  # (width, height) -> blank Surface shared by every headless sprite
+    STAND_IN_SIZE = (100, 100)  # used when a headless run can't read an image's size
+
+    # magic, source mtime_ns, source size, width, height, has alpha
+    CACHE_HEADER = struct.Struct("<4sqqIIB")
+    CACHE_MAGIC = b"SPR1"
+
+    @staticmethod
+    def has_alpha(surface):
+        """True if the surface has per-pixel alpha that isn't fully opaque everywhere."""
+        if not surface.get_flags() & pygame.SRCALPHA:
+            return False
+        return bool(pygame.surfarray.array_alpha(surface).min() < 255)
+
+    @staticmethod
+    def to_display(surface, alpha=None):
+        """Convert a surface to the display format. Left as-is before a display exists."""
+        if pygame.display.get_surface() is None:
+            return surface
+        if alpha is None:
+            alpha = SpriteHandler.has_alpha(surface)
+        if alpha:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    @staticmethod
+    def stand_in(width, height):
+        size = (int(width), int(height))
+        surface = SpriteHandler.stand_ins.get(size)
+        if surface is None:
+            surface = pygame.Surface(size)
+            SpriteHandler.stand_ins[size] = surface
+        return surface
+
+    @staticmethod
+    def image_size(path):
+        """(width, height) of an image file, read from the PNG header when possible."""
+        image = SpriteHandler.images.get(path)
+        if image is not None:
+            return image.get_size()
+        try:
+            with open(path, "rb") as f:
+                header = f.read(24)
+        except OSError:
+            if SpriteHandler.headless:
+                return SpriteHandler.STAND_IN_SIZE
+            raise
+        if header[:8] == b"\x89PNG\r\n\x1a\n":
+            return struct.unpack(">II", header[16:24])
+        if SpriteHandler.headless:
+            return SpriteHandler.STAND_IN_SIZE
+        return SpriteHandler.load_image(path).get_size()
+
+    @staticmethod
+    def load_image(path):
+        """Load an image at its original size, in display format."""
+        if SpriteHandler.headless:
+            return SpriteHandler.stand_in(*SpriteHandler.image_size(path))
+        image = SpriteHandler.images.get(path)
+        if image is None:
+            image = SpriteHandler.to_display(pygame.image.load(path))
+            # Only keep it once it could be converted
+            if pygame.display.get_surface() is not None:
+                SpriteHandler.images[path] = image
+        return image
+
+    @staticmethod
+    def cache_file(path, width, height):
+        display = pygame.display.get_surface()
+        if SpriteHandler.cache_dir is None or display is None:
+            return None
+        resolution = "{}x{}".format(*display.get_size())
+        name = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:16]
+        return os.path.join(SpriteHandler.cache_dir, resolution, f"{name}_{width}x{height}.bin")
+
+    @staticmethod
+    def read_cached(cache_file, stat, width, height):
+        """Return the cached sprite, or None if it's missing or stale."""
+        try:
+            with open(cache_file, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        header = SpriteHandler.CACHE_HEADER
+        if len(data) < header.size:
+            return None
+        magic, mtime, size, w, h, alpha = header.unpack_from(data)
+        if (magic, mtime, size, w, h) != (SpriteHandler.CACHE_MAGIC, stat.st_mtime_ns, stat.st_size, width, height):
+            return None
+        pixels = data[header.size:]
+        fmt = "RGBA" if alpha else "RGB"
+        if len(pixels) != width * height * len(fmt):
+            return None
+        return SpriteHandler.to_display(pygame.image.frombytes(pixels, (width, height), fmt), alpha=bool(alpha))
+
+    @staticmethod
+    def write_cached(cache_file, stat, sprite, alpha):
+        """Save a scaled sprite to the cache; failures are ignored."""
+        width, height = sprite.get_size()
+        fmt = "RGBA" if alpha else "RGB"
+        header = SpriteHandler.CACHE_HEADER.pack(
+            SpriteHandler.CACHE_MAGIC, stat.st_mtime_ns, stat.st_size, width, height, alpha
+        )
+        # Write then rename so a crash never leaves a half-written entry
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file + ".tmp", "wb") as f:
+                f.write(header)
+                f.write(pygame.image.tobytes(sprite, fmt))
+            os.replace(cache_file + ".tmp", cache_file)
+        except OSError:
+            # The cache is best-effort: a read-only checkout or full disk just means no cache
+            try:
+                os.remove(cache_file + ".tmp")
+            except OSError:
+                pass
+
     @staticmethod
     def load_sprite(path, width, height):
         """Load and scale a sprite from a file."""
-        sprite = pygame.image.load(path)
-        return pygame.transform.scale(sprite, (width, height))
-    
+        width, height = int(width), int(height)
+        if SpriteHandler.headless:
+            return SpriteHandler.stand_in(width, height)
+        image = SpriteHandler.images.get(path)
+        if image is not None:
+            return pygame.transform.scale(image, (width, height))
+
+        cache_file = SpriteHandler.cache_file(path, width, height)
+        if cache_file:
+            stat = os.stat(path)
+            sprite = SpriteHandler.read_cached(cache_file, stat, width, height)
+            if sprite is not None:
+                return sprite
+
+        # Convert the scaled copy rather than the (usually much bigger) original
+        sprite = pygame.transform.scale(pygame.image.load(path), (width, height))
+        alpha = SpriteHandler.has_alpha(sprite)
+        if cache_file:
+            SpriteHandler.write_cached(cache_file, stat, sprite, alpha)
+        return SpriteHandler.to_display(sprite, alpha=alpha)
+
     @staticmethod
     def load_sprites(paths, width, height):
         """Load multiple sprites, e.g., for animations."""
@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+from enemies.enemy import Enemy
+from enemies.skeleton_monster import SkeletonMonster
+from sprite_handler.spriteHandler import SpriteHandler
+
+
+def test_build_frames_loads_from_sprite_dir(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(SpriteHandler, "image_size", staticmethod(lambda path: (500, 400)))
+    monkeypatch.setattr(SpriteHandler, "load_sprite",
+                        staticmethod(lambda path, width, height: loaded.append((os.path.normpath(path), width, height))))
+
+    SkeletonMonster.build_frames()
+    boss = os.path.normpath("assets/boss-monster-game-sprites/boss_3/PNG")
+    assert loaded[0] == (os.path.join(boss, "0_boss_attack_000.png"), 100, 80)
+    assert loaded[1:21] == [(os.path.join(boss, f"0_boss_run_{i:03}.png"), 100, 80) for i in range(20)]
+    assert loaded[21:] == [(os.path.join(boss, f"0_boss_attack_{i:03}.png"), 100, 80) for i in range(20)]
+
+
+def test_enemy_without_sprites_cannot_build_frames():
+    with pytest.raises(NotImplementedError):
+        Enemy.build_frames()
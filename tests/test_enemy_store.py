@@ -0,0 +1,81 @@
+import random
+
+import pygame
+
+from enemies.enemy_store import EnemyStore
+from path_finder import FlowField, FieldPath
+from towers.targeting import batched_targets
+
+
+class FakeEnemy:
+    def __init__(self, x, y):
+        self.pos = pygame.math.Vector2(x, y)
+        self.speed = 2
+        self.path = []
+        self.path_pos = 0
+        # What step() touches for drawing
+        self.rect = pygame.Rect(0, 0, 10, 10)
+        self.imgs = self.imgs_left = [None]
+        self.animation_count = 0
+        self.nearest_target = None
+
+
+class FakeTower:
+    def __init__(self, x, y, attack_range):
+        self.x, self.y, self.attack_range = x, y, attack_range
+
+    def range_circle(self):
+        return self.x, self.y, self.attack_range
+
+
+def test_batched_targets_keep_list_order_after_swap_remove():
+    rng = random.Random(0)
+    store = EnemyStore(40, 40)
+    enemies = []
+    for _ in range(300):
+        enemy = FakeEnemy(rng.uniform(0, 1920), rng.uniform(0, 1080))
+        store.add(enemy)
+        enemies.append(enemy)
+        # Kill some as we go, like the game does mid-wave
+        if rng.random() < 0.3:
+            dead = enemies.pop(rng.randrange(len(enemies)))
+            store.remove(dead)
+            assert dead.slot is None
+
+    assert store.count == len(enemies)
+    assert all(store.enemies[enemy.slot] is enemy for enemy in enemies)
+
+    towers = [FakeTower(rng.uniform(0, 1920), rng.uniform(0, 1080), 500) for _ in range(10)]
+    expected = [[e for e in enemies if (e.pos.x - t.x) ** 2 + (e.pos.y - t.y) ** 2 <= t.attack_range ** 2]
+                for t in towers]
+    assert batched_targets(towers, store) == expected
+
+
+def test_field_path_steps_along_the_flow_field():
+    grid = [
+        [1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 1],
+        [1, 1, 1, 0, 1],
+        [0, 0, 1, 1, 1],
+    ]
+    field = FlowField(grid, (0, 2))
+    store = EnemyStore(10, 10)
+    enemy = FakeEnemy(41, 31)
+    enemy.path = FieldPath(field, (4, 3))
+    store.add(enemy)
+
+    visited = [tuple(store.field_cell[enemy.slot].tolist())]
+    for _ in range(500):
+        store.step()
+        cell = tuple(store.field_cell[enemy.slot].tolist())
+        if visited[-1] != cell:
+            visited.append(cell)
+    # The enemy already stands in its start cell, so it heads straight for the next one
+    assert visited == field.path_from(4, 3)[1:]
+    # Steps are a whole speed long, so it can stop just past the last corner
+    x, y = store.pos[enemy.slot]
+    assert abs(x) <= enemy.speed and abs(y - 20) <= enemy.speed
+    assert not store.on_field[enemy.slot]
+    # Reported once, for the scheduler's path_ended()
+    assert store.take_ended() == [enemy]
+    assert store.take_ended() == []
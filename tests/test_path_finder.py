@@ -0,0 +1,121 @@
+import os
+import random
+
+from path_finder import Pathfinder, IncrementalField, HierarchicalGrid, ArrayGrid
+
+
+def owner_by_walking(field, x, y):
+    """The target a cell leads to, found by following the map to its goal."""
+    path = field.path_from(x, y)
+    if not path:
+        return None
+    return field.goals[field.index(*path[-1])]
+
+
+def test_incremental_owner_follows_removed_goal():
+    field = IncrementalField([[1, 0, 1], [0, 1, 0], [1, 0, 1]])
+    field.add_goal((1, 2), "T1")
+    field.add_goal((2, 0), "T2")
+    field.add_goal((2, 1), "T3")
+    field.remove_goal((1, 2))
+    assert field.target_at(0, 0)[0] == "T3"
+
+
+def test_incremental_owners_match_walked_paths():
+    rng = random.Random(5)
+    for _ in range(20):
+        rows, cols = rng.randint(3, 12), rng.randint(3, 12)
+        matrix = [[1 if rng.random() < 0.75 else 0 for _ in range(cols)] for _ in range(rows)]
+        field = IncrementalField(matrix)
+        goals = {}
+        for step in range(12):
+            if goals and rng.random() < 0.4:
+                field.remove_goal(goals.pop(rng.choice(sorted(goals))))
+            else:
+                cell = (rng.randrange(cols), rng.randrange(rows))
+                if cell in goals.values():
+                    continue
+                name = f"T{step}"
+                goals[name] = cell
+                field.add_goal(cell, name)
+            for y in range(rows):
+                for x in range(cols):
+                    i = field.index(x, y)
+                    if i in field.goals or not field.walkable[i]:
+                        continue
+                    assert field.target_at(x, y)[0] == owner_by_walking(field, x, y), (x, y)
+
+
+def random_matrix(rng, rows, cols, open_ratio):
+    return [[1 if rng.random() < open_ratio else 0 for _ in range(cols)] for _ in range(rows)]
+
+
+def test_hierarchical_corner_entrance():
+    # The only way out of start's cluster is a diagonal step across a cluster corner
+    matrix = [[0] * 24 for _ in range(9)]
+    for x, y in ((21, 6), (20, 5), (19, 5)):
+        matrix[y][x] = 1
+    path = HierarchicalGrid(matrix, cluster_size=3).find_path((21, 6), (19, 5))
+    assert [tuple(point) for point in path] == [(21, 6), (20, 5), (19, 5)]
+
+
+def test_hierarchical_reachability_matches_flat_astar():
+    rng = random.Random(7)
+    for _ in range(40):
+        rows, cols = rng.randint(6, 30), rng.randint(6, 30)
+        matrix = random_matrix(rng, rows, cols, rng.uniform(0.45, 0.8))
+        hierarchy = HierarchicalGrid(matrix, cluster_size=rng.randint(3, 6))
+        flat = ArrayGrid(matrix)
+        free = [(x, y) for y in range(rows) for x in range(cols) if matrix[y][x]]
+        for _ in range(30):
+            start, end = rng.choice(free), rng.choice(free)
+            path = [tuple(point) for point in hierarchy.find_path(start, end)]
+            assert bool(path) == bool(len(flat.find_path(start, end))), (start, end)
+            if path:
+                assert path[0] == start and path[-1] == end
+                for (x0, y0), (x1, y1) in zip(path, path[1:]):
+                    assert max(abs(x1 - x0), abs(y1 - y0)) == 1
+                    assert matrix[y1][x1]
+
+
+def test_corrupt_route_cache_is_a_miss(tmp_path):
+    grid = [[1] * 6 for _ in range(4)]
+    spawns, target = [(0, 0), (0, 3)], (5, 2)
+    fresh = Pathfinder(grid, 10, 10, mode="flow_field", spawn_points=spawns, route_target=target,
+                       route_cache_dir=str(tmp_path))
+    [cache_file] = os.listdir(tmp_path)
+
+    # A crash mid-write used to leave files like this behind
+    for junk in ("", '{"target": [5, 2], "starts": [[0, 0]', '{"paths": 3}'):
+        (tmp_path / cache_file).write_text(junk)
+        loaded = Pathfinder(grid, 10, 10, mode="flow_field", spawn_points=spawns, route_target=target,
+                            route_cache_dir=str(tmp_path))
+        assert loaded.routes == fresh.routes
+    # ...and the rebuilt table replaces the bad entry
+    assert Pathfinder.read_routes(str(tmp_path / cache_file), sorted(spawns), target) is not None
+    assert os.listdir(tmp_path) == [cache_file]
+
+
+def test_flow_field_lookups_count_as_cache_hits():
+    pathfinder = Pathfinder([[1] * 6 for _ in range(4)], 10, 10, mode="flow_field")
+    pathfinder.field_path((0, 0), (5, 2))
+    pathfinder.field_path((0, 3), (5, 2))
+    pathfinder.field_path((0, 3), (4, 0))
+    assert pathfinder.cache_stats() == (1, 2, 2)
+
+
+def test_unwritable_route_cache_keeps_routes_in_memory(tmp_path):
+    grid = [[1] * 6 for _ in range(4)]
+    blocked = tmp_path / "routes"
+    blocked.write_text("")  # a file where the cache directory should go
+    pathfinder = Pathfinder(grid, 10, 10, mode="flow_field", spawn_points=[(0, 0)], route_target=(5, 2),
+                            route_cache_dir=str(blocked))
+    assert pathfinder.routes[((0, 0), (5, 2))]
+
+
+def test_route_cache_keeps_one_entry_per_target(tmp_path):
+    grid = [[1] * 6 for _ in range(4)]
+    for target in ((5, 2), (5, 0), (5, 2)):
+        Pathfinder(grid, 10, 10, mode="flow_field", spawn_points=[(0, 0)], route_target=target,
+                   route_cache_dir=str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 2
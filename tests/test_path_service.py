@@ -0,0 +1,121 @@
+import time
+
+from path_finder import Pathfinder
+from path_service import PathService, RepathScheduler
+
+
+class FakeTarget:
+    def __init__(self, cell):
+        self.cell = cell
+        self.life = 100
+
+    def get_coord(self, cell_width, cell_height):
+        return self.cell
+
+
+class FakeEnemy:
+    cell_width = cell_height = 40
+
+    def __init__(self, cell, target, last_repath=0):
+        self.cell = cell
+        self.nearest_target = target
+        self.last_repath = last_repath
+        self.life = 100
+
+    def get_coord(self, cell_width, cell_height):
+        return self.cell
+
+
+def run(scheduler, now):
+    repathed = []
+    scheduler.run(now, repathed.append)
+    return repathed
+
+
+def test_enemy_whose_path_ran_out_is_urgent():
+    tower = FakeTarget((20, 10))
+    stuck = FakeEnemy((5, 5), tower)
+    empty = FakeEnemy((6, 5), tower)
+    arrived = FakeEnemy((19, 10), tower)
+    walking = FakeEnemy((7, 5), tower)
+    scheduler = RepathScheduler(interval=2000, budget_ms=None)
+    for enemy in (stuck, empty, arrived, walking):
+        scheduler.track(enemy)
+
+    # All four were repathed just now, so nothing is stale yet
+    assert run(scheduler, 100) == []
+    scheduler.path_ended([stuck, empty, arrived])
+    # Standing next to its target is where a path is meant to end
+    assert run(scheduler, 133) == [stuck, empty]
+    assert run(scheduler, 166) == []
+
+
+def test_enemy_whose_target_died_is_urgent():
+    tower = FakeTarget((20, 10))
+    enemy = FakeEnemy((19, 10), tower)
+    scheduler = RepathScheduler(interval=2000, budget_ms=None)
+    scheduler.track(enemy)
+    tower.life = 0
+    scheduler.target_lost([enemy])
+    assert run(scheduler, 100) == [enemy]
+
+
+def test_stale_paths_are_repathed_oldest_first():
+    tower = FakeTarget((20, 10))
+    enemies = [FakeEnemy((i, 0), tower, last_repath=t) for i, t in enumerate([300, 100, None, 200, 2500])]
+    scheduler = RepathScheduler(interval=2000, budget_ms=0)  # one repath per frame
+    for enemy in enemies:
+        scheduler.track(enemy)
+
+    order = [run(scheduler, now) for now in (2400, 2410, 2420, 2430, 2440)]
+    assert order == [[enemies[2]], [enemies[1]], [enemies[3]], [enemies[0]], []]
+    assert scheduler.lag_stats() == (0, 0)
+
+
+def test_failed_search_is_logged_and_retried(capsys):
+    grid = [[1] * 4 for _ in range(4)]
+    service = PathService(Pathfinder(grid, 40, 40, mode="astar"), workers=1)
+    # The end cell is off the map, so the worker's search raises
+    enemy = FakeEnemy((1, 1), FakeTarget((9, 9)), last_repath=500)
+    try:
+        service.request(enemy, enemy.nearest_target)
+        failed = []
+        for _ in range(100):
+            failed += service.deliver()
+            if not service.is_pending(enemy):
+                break
+            time.sleep(0.01)
+    finally:
+        service.shutdown()
+    assert failed == [enemy]
+    assert "Path search (1, 1) -> (9, 9) failed" in capsys.readouterr().err
+
+    scheduler = RepathScheduler(interval=2000, budget_ms=None)
+    scheduler.track(enemy)
+    assert run(scheduler, 600) == []
+    scheduler.retry(failed)
+    assert run(scheduler, 633) == [enemy]
+
+
+def test_flow_field_requests_start_no_workers():
+    grid = [[1] * 4 for _ in range(4)]
+    service = PathService(Pathfinder(grid, 40, 40, mode="flow_field"), workers=2)
+    enemy = FakeEnemy((1, 1), FakeTarget((3, 3)))
+    service.request(enemy, enemy.nearest_target)
+    assert enemy.path.field is not None
+    assert service.executor is None
+    service.shutdown()
+
+
+def test_lag_stats_report_the_backlog_under_a_tiny_budget():
+    tower = FakeTarget((20, 10))
+    enemies = [FakeEnemy((i, 0), tower, last_repath=10 * i) for i in range(10)]
+    scheduler = RepathScheduler(interval=2000, budget_ms=0)  # one repath per frame
+    for enemy in enemies:
+        scheduler.track(enemy)
+
+    assert run(scheduler, 2500) == [enemies[0]]
+    # Nine still due, the oldest of them (last repathed at 10) 490 ms past the interval
+    assert scheduler.lag_stats() == (9, 490)
+    assert run(scheduler, 2533) == [enemies[1]]
+    assert scheduler.lag_stats() == (8, 513)
@@ -0,0 +1,37 @@
+import pygame
+
+from renderer import DirtyRenderer
+
+
+def frames(monkeypatch, size=(200, 100)):
+    """A renderer on an off-screen display, and a list of the rects each end() pushed."""
+    pushed = []
+    monkeypatch.setattr(pygame.display, "update", lambda rects=None: pushed.append(rects))
+    display = pygame.Surface(size)
+    return DirtyRenderer(display, pygame.Surface(size)), pushed
+
+
+def test_only_changed_draws_are_pushed(monkeypatch):
+    renderer, pushed = frames(monkeypatch)
+    sprite, other_frame = pygame.Surface((10, 10)), pygame.Surface((10, 10))
+    label, new_label = pygame.Surface((30, 8)), pygame.Surface((30, 8))
+
+    def frame(sprite_image, sprite_pos, label_image):
+        canvas = renderer.begin()
+        canvas.blit(sprite_image, sprite_pos)
+        canvas.fill((255, 0, 0), (150, 50, 20, 5))
+        canvas.blit(label_image, (0, 0))
+        renderer.end()
+        return pushed[-1]
+
+    assert frame(sprite, (50, 50), label) is None  # first frame: full redraw
+    pushed.append("nothing")
+    frame(sprite, (50, 50), label)
+    assert pushed[-1] == "nothing"
+
+    # Moved: the new spot and the one it left
+    assert sorted(map(tuple, frame(sprite, (60, 50), label))) == [(50, 50, 10, 10), (60, 50, 10, 10)]
+    # Next animation frame in place
+    assert list(map(tuple, frame(other_frame, (60, 50), label))) == [(60, 50, 10, 10)]
+    # New text
+    assert list(map(tuple, frame(other_frame, (60, 50), new_label))) == [(0, 0, 30, 8)]
@@ -0,0 +1,61 @@
+from game import Game, TOWER_TYPES
+from input_log import InputLog, SELECT, PLACE
+from towers.archer_tower import ArcherTower
+from towers.fire_tower import FireTower
+
+# Free spots around the main tower at 1920x1080
+SPOTS = [(1420, 460), (1140, 340), (1140, 700), (1580, 700)]
+
+
+def final_state(game):
+    return {
+        "ticks": game.ticks,
+        "state": game.state,
+        "score": game.points_manager.get_points(),
+        "gold": game.gold_manager.get_points(),
+        "enemies_alive": len(game.enemies),
+        "main_tower_life": game.main_tower.life,
+    }
+
+
+def record(path, towers, draw_towers=False, ticks=1500):
+    """Play a seeded headless game, placing one tower of each type in turn when affordable."""
+    game = Game(headless=True, seed=3, record=str(path))
+    game.state = 'running'
+    placed = 0
+    while game.state == 'running' and game.ticks < ticks:
+        if placed < len(SPOTS) and game.gold_manager.get_points() >= 50:
+            kind = TOWER_TYPES.index(towers[placed % len(towers)])
+            x, y = SPOTS[placed]
+            game.handle_input(SELECT, kind, x, y)
+            game.handle_input(PLACE, kind, x, y)
+            placed += 1
+        game.update()
+        if draw_towers:
+            # What the windowed game does between ticks
+            for tower in game.towers:
+                tower.draw(game.win, game.sim_clock.now)
+    game.stop_recording()
+    return game
+
+
+def replay(path):
+    log = InputLog.load(str(path))
+    game = Game(headless=True, size=log.size, seed=log.seed, deterministic=True)
+    game.replay(log)
+    return game
+
+
+def test_replay_with_fire_tower_matches_recording(tmp_path):
+    path = tmp_path / "fire.wlog"
+    recorded = record(path, [FireTower, ArcherTower])
+    assert any(isinstance(tower, FireTower) for tower in recorded.towers)
+    assert final_state(replay(path)) == final_state(recorded)
+
+
+def test_replay_does_not_depend_on_draw_cadence(tmp_path):
+    # Recorded with the towers drawn every tick, replayed without drawing at all
+    path = tmp_path / "drawn.wlog"
+    recorded = record(path, [FireTower], draw_towers=True)
+    assert final_state(replay(path)) == final_state(recorded)
+    assert final_state(recorded) == final_state(record(tmp_path / "undrawn.wlog", [FireTower]))
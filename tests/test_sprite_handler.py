@@ -0,0 +1,24 @@
+import os
+
+import pygame
+
+from sprite_handler.spriteHandler import SpriteHandler
+
+
+def test_failed_cache_write_is_ignored(tmp_path):
+    blocked = tmp_path / "sprites"
+    blocked.write_text("")  # a file where the cache directory should go
+    stat = os.stat(blocked)
+    cache_file = str(blocked / "1920x1080" / "abc_10x10.bin")
+    SpriteHandler.write_cached(cache_file, stat, pygame.Surface((10, 10)), False)
+    assert os.listdir(tmp_path) == ["sprites"]
+
+
+def test_failed_rename_leaves_no_temp_file(tmp_path, monkeypatch):
+    def full_disk(src, dst):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, "replace", full_disk)
+    cache_file = str(tmp_path / "abc_10x10.bin")
+    SpriteHandler.write_cached(cache_file, os.stat(tmp_path), pygame.Surface((10, 10)), False)
+    assert os.listdir(tmp_path) == []
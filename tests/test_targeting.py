@@ -0,0 +1,42 @@
+import random
+
+import pygame
+
+from enemies.spatial_hash import SpatialHash
+from towers.targeting import hash_prunes
+
+
+class FakeEnemy:
+    def __init__(self, x, y):
+        self.pos = pygame.math.Vector2(x, y)
+        self.rect = pygame.Rect(0, 0, 100, 100)
+        self.rect.center = (int(x), int(y))
+
+
+class FakeTower:
+    def __init__(self, x, y, attack_range):
+        self.x, self.y, self.attack_range = x, y, attack_range
+
+    def range_circle(self):
+        return self.x, self.y, self.attack_range
+
+    def in_range(self, enemy):
+        return (enemy.pos.x - self.x) ** 2 + (enemy.pos.y - self.y) ** 2 <= self.attack_range ** 2
+
+
+def test_only_short_ranges_use_the_hash():
+    assert hash_prunes(FakeTower(960, 540, 300), 1920, 1080)            # MainTower's range
+    assert not hash_prunes(FakeTower(960, 540, 1920 * 0.4), 1920, 1080)  # placed archer/fire towers
+    # Clipped to the map: a corner tower covers a quarter of its box
+    assert hash_prunes(FakeTower(0, 0, 600), 1920, 1080)
+
+
+def test_hash_query_finds_what_a_scan_finds():
+    rng = random.Random(1)
+    enemies = [FakeEnemy(rng.uniform(0, 1920), rng.uniform(0, 1080)) for _ in range(300)]
+    index = SpatialHash(40, 40)
+    index.rebuild(enemies)
+    for _ in range(20):
+        tower = FakeTower(rng.uniform(0, 1920), rng.uniform(0, 1080), 300)
+        scanned = [enemy for enemy in enemies if tower.in_range(enemy)]
+        assert [enemy for enemy in index.query(*tower.range_circle()) if tower.in_range(enemy)] == scanned
@@ -0,0 +1,48 @@
+from collections import OrderedDict
+
+import pygame
+
+class TextCache:
+    """
+    Shared cache of fonts and rendered text surfaces.
+    Fonts are created once per (name, size); rendered strings are kept in an
+    LRU keyed by (font, size, text, colour), so a label is only re-rendered
+    when its text or colour changes.
+    """
+    max_surfaces = 256
+    fonts = {}
+    surfaces = OrderedDict()
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def get_font(cls, size, name=None, sysfont=True):
+        """Return the font for (name, size), creating it the first time."""
+        key = (name, size, sysfont)
+        font = cls.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size) if sysfont else pygame.font.Font(name, size)
+            cls.fonts[key] = font
+        return font
+
+    @classmethod
+    def render(cls, text, size, color, name=None, sysfont=True, antialias=True):
+        """Return the rendered surface for text, from the cache when possible."""
+        key = (name, size, sysfont, text, tuple(color), antialias)
+        surface = cls.surfaces.get(key)
+        if surface is not None:
+            cls.hits += 1
+            cls.surfaces.move_to_end(key)
+            return surface
+
+        cls.misses += 1
+        surface = cls.get_font(size, name, sysfont).render(text, antialias, color)
+        cls.surfaces[key] = surface
+        if len(cls.surfaces) > cls.max_surfaces:
+            cls.surfaces.popitem(last=False)
+        return surface
+
+    @classmethod
+    def clear(cls):
+        cls.fonts.clear()
+        cls.surfaces.clear()
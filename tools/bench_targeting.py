@@ -0,0 +1,121 @@
+"""
+Benchmark of the tower range checks: the per-tower Python scan, the spatial
+hash and the batched NumPy pass (towers/targeting.py).
+Prints the time per frame for a grid of tower/enemy counts and the number of
+tower/enemy pairs where the batched pass starts to win, then the scan against
+a query of the (already built) hash by tower range, with the share of the map
+each range box covers (HASH_TARGETING_MAX_COVER).
+
+Run from the repository root: python tools/bench_targeting.py
+"""
+import os
+import sys
+import math
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from enemies.enemy_store import EnemyStore
+from enemies.spatial_hash import SpatialHash
+from towers.targeting import batched_targets, HASH_TARGETING_MAX_COVER
+
+WIDTH, HEIGHT = 1920, 1080
+CELL = 40
+
+
+class FakeEnemy:
+    def __init__(self, x, y):
+        self.pos = pygame.math.Vector2(x, y)
+        self.rect = pygame.Rect(0, 0, 100, 100)
+        self.rect.center = (int(x), int(y))
+        self.speed = 2
+        self._path = []
+        self.path = []
+        self.path_pos = 0
+
+
+class FakeTower:
+    """Same range test as ArcherTower/FireTower."""
+    def __init__(self, x, y, attack_range):
+        self.x, self.y, self.attack_range = x, y, attack_range
+
+    def enemy_in_range(self, enemy):
+        distance = math.sqrt((self.x - enemy.pos.x) ** 2 + (self.y - enemy.pos.y) ** 2)
+        return distance <= self.attack_range
+
+    def range_circle(self):
+        return self.x, self.y, self.attack_range
+
+
+def scalar(towers, enemies, store, index):
+    return [[e for e in enemies if t.enemy_in_range(e)] for t in towers]
+
+
+def hashed(towers, enemies, store, index):
+    index.rebuild(enemies)
+    return [[e for e in index.query(*t.range_circle()) if t.enemy_in_range(e)] for t in towers]
+
+
+def batched(towers, enemies, store, index):
+    return batched_targets(towers, store)
+
+
+def main():
+    random.seed(0)
+    attack_range = int(WIDTH * 0.4)  # what the game gives placed towers
+    results = []  # (pairs, batched is fastest)
+
+    print(f"{'towers':>6} {'enemies':>7} {'pairs':>7} {'scalar ms':>10} {'hash ms':>9} {'batched ms':>11}")
+    for n_towers in (1, 5, 20, 50):
+        for n_enemies in (10, 50, 200, 1000):
+            enemies = [FakeEnemy(random.uniform(0, WIDTH), random.uniform(0, HEIGHT)) for _ in range(n_enemies)]
+            towers = [FakeTower(random.uniform(0, WIDTH), random.uniform(0, HEIGHT), attack_range) for _ in range(n_towers)]
+            store = EnemyStore(CELL, CELL)
+            for enemy in enemies:
+                store.add(enemy)
+            index = SpatialHash(CELL, CELL)
+
+            assert scalar(towers, enemies, store, index) == batched(towers, enemies, store, index)
+
+            times = []
+            for engine in (scalar, hashed, batched):
+                runs = max(1, 2000 // (n_towers * n_enemies) + 1)
+                t = timeit.timeit(lambda: engine(towers, enemies, store, index), number=runs) / runs
+                times.append(t * 1000)
+
+            pairs = n_towers * n_enemies
+            results.append((pairs, times[2] < min(times[0], times[1])))
+            print(f"{n_towers:>6} {n_enemies:>7} {pairs:>7} {times[0]:>10.3f} {times[1]:>9.3f} {times[2]:>11.3f}")
+
+    # Smallest size from which the batched pass wins every measured case
+    losses = [pairs for pairs, won in results if not won]
+    crossover = min((pairs for pairs, _ in results if pairs > max(losses, default=0)), default=None)
+    print(f"\nbatched pass wins from about {crossover} tower/enemy pairs")
+
+    # The game rebuilds the hash every step for the arrows anyway, so only the query counts here
+    n_towers = 20
+    print(f"\n{n_towers} towers, ms per tower, scan / hash query")
+    print(f"{'range':>6} {'cover':>6} " + " ".join(f"{f'{n} enemies':>15}" for n in (10, 50, 200, 1000)))
+    for attack_range in (100, 200, 300, 450, 600, int(WIDTH * 0.4)):
+        cover = min(2 * attack_range, WIDTH) * min(2 * attack_range, HEIGHT) / (WIDTH * HEIGHT)
+        cells = []
+        for n_enemies in (10, 50, 200, 1000):
+            enemies = [FakeEnemy(random.uniform(0, WIDTH), random.uniform(0, HEIGHT)) for _ in range(n_enemies)]
+            towers = [FakeTower(random.uniform(0, WIDTH), random.uniform(0, HEIGHT), attack_range) for _ in range(n_towers)]
+            index = SpatialHash(CELL, CELL)
+            index.rebuild(enemies)
+            runs = max(1, 20000 // (n_towers * n_enemies) + 1)
+            scan = timeit.timeit(lambda: scalar(towers, enemies, None, index), number=runs) / runs
+            query = timeit.timeit(
+                lambda: [[e for e in index.query(*t.range_circle()) if t.enemy_in_range(e)] for t in towers],
+                number=runs
+            ) / runs
+            cells.append(f"{scan * 1000 / n_towers:.3f} / {query * 1000 / n_towers:.3f}")
+        print(f"{attack_range:>6} {cover:>6.2f} " + " ".join(f"{cell:>15}" for cell in cells))
+    print(f"\nthe game queries the hash for range boxes covering up to {HASH_TARGETING_MAX_COVER:.2f} of the map")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Replays an input log recorded with `python game.py --record PATH`: the same
+seed, screen size and inputs at the same ticks, so the simulation does
+exactly the same work as the recorded game. Prints per-tick update() timings,
+for chasing frame-time spikes and comparing optimizations on one workload.
+
+    python tools/replay.py run.wlog                       # headless, flat out
+    python tools/replay.py run.wlog --render --speed 4    # windowed, 4x real time
+
+Run from the repository root.
+"""
+import os
+import sys
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from input_log import InputLog
+from sim_clock import TICK_MS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log")
+    parser.add_argument("--render", action="store_true", help="draw the replay in a window")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="with --render, simulation speed relative to real time (default: as fast as possible)")
+    parser.add_argument("--slowest", type=int, default=5, help="how many of the slowest ticks to list")
+    args = parser.parse_args()
+
+    from game import Game
+
+    log = InputLog.load(args.log)
+    game = Game(headless=not args.render, size=log.size, seed=log.seed, deterministic=True)
+    update_ms = game.replay(log, render=args.render, time_scale=args.speed)
+    if not update_ms:
+        print("Nothing to replay")
+        return
+
+    ordered = sorted(update_ms)
+    total = sum(update_ms)
+    print(f"seed {log.seed}, {log.size[0]}x{log.size[1]}, {len(log.events)} inputs")
+    print(f"{len(update_ms)} ticks ({len(update_ms) * TICK_MS / 1000:.1f} s of game) in {total / 1000:.2f} s of update()")
+    print(f"final: state {game.state}, wave {game.wave_count}, score {game.points_manager.get_points()}, "
+          f"gold {game.gold_manager.get_points()}, main tower {max(game.main_tower.life, 0)}")
+    print(f"update ms: mean {statistics.fmean(update_ms):.3f}, median {ordered[len(ordered) // 2]:.3f}, "
+          f"p99 {ordered[int(len(ordered) * 0.99)]:.3f}, max {ordered[-1]:.3f}")
+    slowest = sorted(range(len(update_ms)), key=update_ms.__getitem__, reverse=True)[:args.slowest]
+    for tick in sorted(slowest):
+        print(f"  tick {tick + 1}: {update_ms[tick]:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Batch balance simulator: plays N seeded headless games of the current Game
+rules across a process pool, with a scripted tower-placement policy standing
+in for the player, and reports how long each game lasted, waves survived,
+the gold and main-tower HP over time, how well the path cache did and how
+far the repath scheduler fell behind (worst backlog and lag past the repath
+interval; only nonzero with --repath-budget, as headless games repath
+everything that is due).
+
+Rules can be overridden per sweep without touching the game, e.g.
+
+    python tools/simulate.py --games 1000 --policy mixed \\
+        --set spawn_interval=3500 --enemy StoneMonster.life=2500 --price ArcherTower=60 \\
+        --csv report.csv --json report.json
+
+Run from the repository root.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import statistics
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from path_finder import matrix
+from sim_clock import TICK_RATE
+
+# Which tower each policy buys next, cycling through the list
+POLICIES = {
+    "none": [],
+    "archer": ["ArcherTower"],
+    "fire": ["FireTower"],
+    "mixed": ["ArcherTower", "FireTower"],
+}
+
+
+class PlacementPolicy:
+    """
+    Greedy scripted player: whenever it can afford the next tower in its
+    rotation it buys it, on the free spot closest to the main tower that
+    isn't within one tower width of a tower it already placed.
+    """
+    def __init__(self, game, tower_names):
+        from towers.archer_tower import ArcherTower
+        from towers.fire_tower import FireTower
+        classes = {"ArcherTower": ArcherTower, "FireTower": FireTower}
+        self.game = game
+        self.rotation = [classes[name] for name in tower_names]
+        self.next = 0
+        self.spacing = game.tower_size()[0]
+
+        # Every placeable cell center, nearest to the main tower first
+        cx, cy = game.main_tower.rect.center
+        width, height = game.tower_size()
+        spots = []
+        for row, cells in enumerate(matrix):
+            for col, cell in enumerate(cells):
+                x = col * game.cell_width + game.cell_width // 2
+                y = row * game.cell_height + game.cell_height // 2
+                if cell != 1 or x < width // 2 or y < height // 2:
+                    continue
+                if x + width // 2 > game.width or y + height // 2 > game.height:
+                    continue
+                spots.append(((x - cx) ** 2 + (y - cy) ** 2, x, y))
+        self.spots = [(x, y) for _, x, y in sorted(spots)]
+
+    def act(self):
+        """Buy as many towers as the gold allows. Returns how many were placed."""
+        placed = 0
+        while self.rotation:
+            tower_cls = self.rotation[self.next % len(self.rotation)]
+            if self.game.gold_manager.get_points() < self.game.new_tower(tower_cls, 0, 0).price:
+                break
+            tower = None
+            for x, y in self.spots:
+                if self.crowded(x, y):
+                    continue
+                tower = self.game.place_tower(tower_cls, x, y)
+                if tower:
+                    break
+            if tower is None:
+                break  # no room left
+            self.next += 1
+            placed += 1
+        return placed
+
+    def crowded(self, x, y):
+        for tower in self.game.towers:
+            tx, ty = tower.rect.center
+            if (tx - x) ** 2 + (ty - y) ** 2 < self.spacing ** 2:
+                return True
+        return False
+
+
+def play(job):
+    """Play one game to the end (or max_ticks). Runs in a pool worker."""
+    from game import Game
+
+    game = Game(headless=True, size=job["size"], seed=job["seed"])
+    for name, value in job["settings"].items():
+        setattr(game, name, value)
+    game.enemy_stats = job["enemy_stats"]
+    game.tower_prices = job["tower_prices"]
+    if job["repath_budget_ms"] is not None:
+        game.repath_scheduler.budget_ms = job["repath_budget_ms"]
+    policy = PlacementPolicy(game, POLICIES[job["policy"]])
+
+    act_every = max(1, int(job["act_every"] * TICK_RATE))
+    sample_every = max(1, int(job["sample_every"] * TICK_RATE))
+    gold_curve, hp_curve = [], []
+    towers_built = 0
+    backlog_max = lag_max = 0
+
+    started = time.perf_counter()
+    game.state = 'running'
+    ticks = 0
+    while game.state == 'running' and ticks < job["max_ticks"]:
+        if ticks % act_every == 0:
+            towers_built += policy.act()
+        if ticks % sample_every == 0:
+            gold_curve.append(game.gold_manager.get_points())
+            hp_curve.append(max(game.main_tower.life, 0))
+        game.update(game.sim_clock.step_ms)
+        backlog, lag = game.repath_scheduler.lag_stats()
+        backlog_max, lag_max = max(backlog_max, backlog), max(lag_max, lag)
+        ticks += 1
+
+    lost = game.state == 'game over'
+    cache_hits, cache_misses, _ = game.pathfinder.cache_stats()
+    return {
+        "seed": job["seed"],
+        "policy": job["policy"],
+        "lost": lost,
+        "ticks": ticks,
+        "seconds": round(game.sim_clock.now / 1000, 2),
+        # The wave the main tower fell in doesn't count
+        "waves_survived": game.wave_count - 1 if lost else game.wave_count,
+        "score": game.points_manager.get_points(),
+        "gold": game.gold_manager.get_points(),
+        "main_tower_hp": max(game.main_tower.life, 0),
+        "towers_built": towers_built,
+        "path_cache_hits": cache_hits,
+        "path_cache_misses": cache_misses,
+        "repath_backlog_max": backlog_max,
+        "repath_lag_max_ms": round(lag_max, 1),
+        "wall_seconds": round(time.perf_counter() - started, 3),
+        "gold_curve": gold_curve,
+        "hp_curve": hp_curve,
+    }
+
+
+def curve_stats(curves, sample_every):
+    """Per sample time: mean, min and max over the games still running then."""
+    points = []
+    for i in range(max((len(curve) for curve in curves), default=0)):
+        values = [curve[i] for curve in curves if i < len(curve)]
+        points.append({
+            "t": round(i * sample_every, 2),
+            "games": len(values),
+            "mean": round(statistics.fmean(values), 2),
+            "min": min(values),
+            "max": max(values),
+        })
+    return points
+
+
+def hit_rate(results):
+    hits = sum(result["path_cache_hits"] for result in results)
+    lookups = hits + sum(result["path_cache_misses"] for result in results)
+    return hits / lookups if lookups else 0.0
+
+
+def summarize(results, sample_every):
+    def spread(key):
+        values = [result[key] for result in results]
+        return {
+            "mean": round(statistics.fmean(values), 2),
+            "median": round(statistics.median(values), 2),
+            "min": min(values),
+            "max": max(values),
+        }
+
+    return {
+        "games": len(results),
+        "lost": sum(result["lost"] for result in results),
+        "waves_survived": spread("waves_survived"),
+        "seconds": spread("seconds"),
+        "score": spread("score"),
+        "towers_built": spread("towers_built"),
+        "path_cache_hit_rate": round(hit_rate(results), 4),
+        "repath_lag_max_ms": spread("repath_lag_max_ms"),
+        "gold_curve": curve_stats([result["gold_curve"] for result in results], sample_every),
+        "hp_curve": curve_stats([result["hp_curve"] for result in results], sample_every),
+    }
+
+
+def simulate(games, seed=0, policy="mixed", workers=None, minutes=20, settings=None,
+             enemy_stats=None, tower_prices=None, act_every=1.0, sample_every=5.0,
+             size=(1920, 1080), repath_budget_ms=None):
+    """
+    Play games seeded seed, seed + 1, ... and return (results, summary).
+    settings are Game attributes set after construction (spawn_interval,
+    wave_interval, ...); enemy_stats and tower_prices are keyed by class name.
+    act_every and sample_every are in simulated seconds. repath_budget_ms
+    gives the repath scheduler a per-tick budget (wall-clock, so no longer
+    deterministic) instead of repathing everything due.
+    """
+    jobs = [{
+        "seed": seed + i,
+        "policy": policy,
+        "max_ticks": int(minutes * 60 * TICK_RATE),
+        "settings": settings or {},
+        "enemy_stats": enemy_stats or {},
+        "tower_prices": tower_prices or {},
+        "act_every": act_every,
+        "sample_every": sample_every,
+        "size": tuple(size),
+        "repath_budget_ms": repath_budget_ms,
+    } for i in range(games)]
+
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        results = [play(job) for job in jobs]
+    else:
+        # spawn: every worker gets a fresh pygame, nothing inherited from this process
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            results = pool.map(play, jobs, chunksize=max(1, games // (workers * 4)))
+    return results, summarize(results, sample_every)
+
+
+def parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="mixed")
+    parser.add_argument("--workers", type=int, default=None, help="pool size (default: one per CPU)")
+    parser.add_argument("--minutes", type=float, default=20, help="simulated minutes before a game is cut off")
+    parser.add_argument("--act-every", type=float, default=1.0, help="simulated seconds between policy decisions")
+    parser.add_argument("--sample-every", type=float, default=5.0, help="simulated seconds between curve samples")
+    parser.add_argument("--set", action="append", default=[], metavar="ATTR=VALUE",
+                        help="Game attribute, e.g. spawn_interval=3500")
+    parser.add_argument("--enemy", action="append", default=[], metavar="CLASS.ATTR=VALUE",
+                        help="enemy stat, e.g. StoneMonster.life=2500")
+    parser.add_argument("--price", action="append", default=[], metavar="CLASS=PRICE",
+                        help="tower price, e.g. ArcherTower=60")
+    parser.add_argument("--repath-budget", type=float, default=None, metavar="MS",
+                        help="per-tick repath budget in ms, to see the scheduler's lag (default: none)")
+    parser.add_argument("--csv", help="write one row per game here")
+    parser.add_argument("--json", help="write the summary, curves and every game here")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    settings = {}
+    for item in args.set:
+        name, value = item.split("=", 1)
+        settings[name] = parse_value(value)
+    enemy_stats = {}
+    for item in args.enemy:
+        key, value = item.split("=", 1)
+        cls_name, name = key.split(".", 1)
+        enemy_stats.setdefault(cls_name, {})[name] = parse_value(value)
+    tower_prices = {}
+    for item in args.price:
+        cls_name, value = item.split("=", 1)
+        tower_prices[cls_name] = int(value)
+
+    started = time.perf_counter()
+    results, summary = simulate(
+        args.games, seed=args.seed, policy=args.policy, workers=args.workers,
+        minutes=args.minutes, settings=settings, enemy_stats=enemy_stats,
+        tower_prices=tower_prices, act_every=args.act_every, sample_every=args.sample_every,
+        repath_budget_ms=args.repath_budget
+    )
+    elapsed = time.perf_counter() - started
+
+    if args.csv:
+        columns = [key for key in results[0] if not key.endswith("_curve")]
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, columns, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(results)
+    if args.json:
+        config = {
+            "games": args.games, "seed": args.seed, "policy": args.policy, "minutes": args.minutes,
+            "settings": settings, "enemy_stats": enemy_stats, "tower_prices": tower_prices,
+            "repath_budget_ms": args.repath_budget,
+        }
+        with open(args.json, "w") as f:
+            json.dump({"config": config, "summary": summary, "games": results}, f, indent=1)
+
+    waves = summary["waves_survived"]
+    seconds = summary["seconds"]
+    print(f"{summary['games']} games in {elapsed:.1f} s, {summary['lost']} lost")
+    print(f"waves survived: mean {waves['mean']}, median {waves['median']}, range {waves['min']}-{waves['max']}")
+    print(f"game length (s): mean {seconds['mean']}, median {seconds['median']}, range {seconds['min']}-{seconds['max']}")
+    hits = sum(result["path_cache_hits"] for result in results)
+    misses = sum(result["path_cache_misses"] for result in results)
+    print(f"path cache: {hits} hits, {misses} misses ({summary['path_cache_hit_rate']:.1%} hit rate)")
+    lag = summary["repath_lag_max_ms"]
+    print(f"repath lag past the interval (ms, worst per game): mean {lag['mean']}, max {lag['max']}, "
+          f"worst backlog {max(result['repath_backlog_max'] for result in results)} enemies")
+
+
+if __name__ == "__main__":
+    main()
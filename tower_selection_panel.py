@@ -3,6 +3,8 @@ import os
 
 from towers.archer_tower import ArcherTower
 from towers.fire_tower import FireTower
+from text_cache.textCache import TextCache
+from sprite_handler.spriteHandler import SpriteHandler
 
 class TowerSelectionPanel:
     def __init__(self, screen_width, screen_height):
@@ -39,7 +41,7 @@ class TowerSelectionPanel:
             if not os.path.exists(t["icon_path"]):
                 raise FileNotFoundError(f"Missing icon: {t['icon_path']}")
             # Load
-            icon = pygame.image.load(t["icon_path"]).convert_alpha()
+            icon = SpriteHandler.load_image(t["icon_path"])
             t["icon"] = icon
 
         # Scale factor to make the panel 1.5 times larger than the old ~100×300
@@ -48,9 +50,9 @@ class TowerSelectionPanel:
         # Icon size
         self.icon_size = int(64 * self.scale_factor)
 
-        # Font for tower name/price
+        # Font size for tower name/price (labels are rendered through TextCache)
         # Adjust size as you wish
-        self.font = pygame.font.SysFont(None, int(20 * self.scale_factor))
+        self.font_size = int(20 * self.scale_factor)
 
         # Panel padding around edges
         self.panel_padding = int(10 * self.scale_factor)
@@ -95,8 +97,7 @@ class TowerSelectionPanel:
 
     def draw(self, surface):
         # Draw panel background
-        pygame.draw.rect(
-            surface, 
+        surface.fill(
             (60, 60, 60), 
             (self.x, self.y, self.width, self.height)
         )
@@ -118,7 +119,7 @@ class TowerSelectionPanel:
 
             # Name + price
             text_str = f"{tower_info['name']} ({tower_info['price']})"
-            text_surf = self.font.render(text_str, True, (255, 255, 255))
+            text_surf = TextCache.render(text_str, self.font_size, (255, 255, 255))
 
             # Position it below the icon
             text_x = rect.centerx - text_surf.get_width() // 2
@@ -2,41 +2,14 @@ import pygame
 import math
 import os
 
-class Arrow(pygame.sprite.Sprite):
-    def __init__(self, start_x, start_y, target_x, target_y, damage, speed=10):
-        super().__init__()
-        self.image = pygame.image.load(os.path.join("assets/archer-tower-game-assets/PNG", "37.png"))
-        self.image = pygame.transform.scale(self.image, (20, 10))  # Adjust size as needed
-        self.rect = self.image.get_rect(center=(start_x, start_y))
-        self.damage = damage  # Arrow damage
-        
-        # Calculate trajectory
-        angle = math.atan2(target_y - start_y, target_x - start_x)
-        self.vel_x = math.cos(angle) * speed
-        self.vel_y = math.sin(angle) * speed
-        
-        # Rotate the arrow to face its direction
-        self.image = pygame.transform.rotate(self.image, -math.degrees(angle))
-        self.target_x = target_x
-        self.target_y = target_y
-
-    def update(self, enemies):
-        # Move the arrow
-        self.rect.x += self.vel_x
-        self.rect.y += self.vel_y
-
-        # Check for collision with enemies
-        for enemy in enemies:
-            if self.rect.colliderect(enemy.rect):
-                enemy.take_damage(self.damage*0.5)  # Apply damage from the arrow
-                self.kill()  # Remove the arrow
-                break
-
-        # Remove arrow if it goes out of bounds
-        if not pygame.display.get_surface().get_rect().contains(self.rect):
-            self.kill()
+from towers.projectiles import ProjectilePool
+from sprite_handler.spriteHandler import SpriteHandler
+from text_cache.textCache import TextCache
 
 class ArcherTower(pygame.sprite.Sprite):
+    # Every archer's arrows fly in one shared pool; the game updates and draws it once per frame
+    projectiles = ProjectilePool()
+
     def __init__(self, x, y, width, height, attack_range=150, damage=25, fire_rate=1):
         super().__init__()
         self.life = 100
@@ -58,26 +31,23 @@ class ArcherTower(pygame.sprite.Sprite):
         self.last_animation_time = 0  # Initialize this attribute here
 
         # Load archer image for idle state (default)
-        self.archer_idle_img = pygame.image.load(os.path.join("assets/archer-tower-game-assets/PNG", "38.png"))
-        self.archer_idle_img = pygame.transform.scale(self.archer_idle_img, (int(self.width * 0.2), int(self.height * 0.2)))
+        self.archer_idle_img = SpriteHandler.load_sprite(os.path.join("assets/archer-tower-game-assets/PNG", "38.png"), int(self.width * 0.2), int(self.height * 0.2))
 
         # Target enemy's position for attack animation
         self.enemies_to_attack = []
         self.left = True  # Direction the archer is facing
 
         # Load and scale the tower base image
-        self.tower_base = pygame.image.load(os.path.join("assets/archer-tower-game-assets/PNG", "10.png"))
-        self.tower_base = pygame.transform.scale(self.tower_base, (self.width * 0.8, self.height * 0.8))
+        self.tower_base = SpriteHandler.load_sprite(os.path.join("assets/archer-tower-game-assets/PNG", "10.png"), self.width * 0.8, self.height * 0.8)
 
         # Load archer animation sprites
         for i in range(38, 43):  # Example frame indices
-            archer_image = pygame.image.load(os.path.join("assets/archer-tower-game-assets/PNG", f"{i}.png"))
-            self.archer_imgs.append(pygame.transform.scale(archer_image, (int(self.width * 0.2), int(self.height * 0.2))))
+            archer_image = SpriteHandler.load_sprite(os.path.join("assets/archer-tower-game-assets/PNG", f"{i}.png"), int(self.width * 0.2), int(self.height * 0.2))
+            self.archer_imgs.append(archer_image)
 
         # Create the rectangle for collision and positioning
         self.rect = self.tower_base.get_rect()
         self.rect.topleft = (self.x, self.y)
-        self.arrows = pygame.sprite.Group()
 
         self.upgrade_button_visible = False
         self.upgrade_button_rect = None
@@ -109,17 +79,15 @@ class ArcherTower(pygame.sprite.Sprite):
         button_y = self.rect.top - button_height - 5  # Position above the tower
         self.upgrade_button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
         # Draw the button background (brown)
-        pygame.draw.rect(window, (139, 69, 19), self.upgrade_button_rect)  # Brown background
+        window.fill((139, 69, 19), self.upgrade_button_rect)  # Brown background
         # Add a border (grey contour)
         pygame.draw.rect(window, (128, 128, 128), self.upgrade_button_rect, 2)  # Grey border
-        # Initialize the font and render the text
+        # Render the 'Upgrade' text in white with anti-aliasing; the font and surface are cached
         try:
-            font = pygame.font.Font(None, 24)  # Slightly larger font for better readability
+            text_surface = TextCache.render("Upgrade", 24, (255, 255, 255), sysfont=False)  # Slightly larger font for better readability
         except pygame.error as e:
             print(f"Font initialization error: {e}")
             return  # Skip drawing if the font fails to load
-        # Render the 'Upgrade' text in white with anti-aliasing for smoothness
-        text_surface = font.render("Upgrade", True, (255, 255, 255))  # White text
         text_rect = text_surface.get_rect(center=self.upgrade_button_rect.center)
         window.blit(text_surface, text_rect)
 
@@ -148,8 +116,7 @@ class ArcherTower(pygame.sprite.Sprite):
     def upgrade(self):
         self.life += self.max_life
         self.damage += 25
-        self.tower_base = pygame.image.load(os.path.join("assets/archer-tower-game-assets/PNG", "12.png"))
-        self.tower_base = pygame.transform.scale(self.tower_base, (self.width * 0.8, self.height * 0.8))
+        self.tower_base = SpriteHandler.load_sprite(os.path.join("assets/archer-tower-game-assets/PNG", "12.png"), self.width * 0.8, self.height * 0.8)
 
     def get_coord(self, cell_width, cell_height):
         col = int(self.rect.centerx / cell_width)
@@ -160,14 +127,21 @@ class ArcherTower(pygame.sprite.Sprite):
         distance = math.sqrt((self.x - enemy.pos.x) ** 2 + (self.y - enemy.pos.y) ** 2)
         return distance <= self.attack_range
 
+    def range_circle(self):
+        """Return (x, y, radius) of the area enemy_in_range checks."""
+        return self.x, self.y, self.attack_range
+
     def attack(self, enemies, current_time):
-        self.enemies_to_attack = [enemy for enemy in enemies if self.enemy_in_range(enemy)]
+        self.attack_targets([enemy for enemy in enemies if self.enemy_in_range(enemy)], current_time)
+
+    def attack_targets(self, enemies_in_range, current_time):
+        """Shoot at the first enemy of an already range-filtered list."""
+        self.enemies_to_attack = enemies_in_range
         if self.enemies_to_attack:
             enemy = self.enemies_to_attack[0]
             if current_time - self.last_shot_time >= 1000 / self.fire_rate:
                 # Pass self.damage when creating the arrow
-                arrow = Arrow(self.x + self.width // 2, self.y + self.height // 4, enemy.rect.centerx, enemy.rect.centery, self.damage)
-                self.arrows.add(arrow)
+                self.projectiles.spawn(self.x + self.width // 2, self.y + self.height // 4, enemy.rect.centerx, enemy.rect.centery, self.damage)
                 self.last_shot_time = current_time
 
                 # Adjust archer's facing direction
@@ -181,7 +155,7 @@ class ArcherTower(pygame.sprite.Sprite):
     def _flip_archer_imgs(self):
         self.archer_imgs = [pygame.transform.flip(img, True, False) for img in self.archer_imgs]
 
-    def draw(self, window, current_time, enemies):
+    def draw(self, window, current_time):
         # Draw the tower base
         window.blit(self.tower_base, (self.x, self.y))
 
@@ -194,10 +168,6 @@ class ArcherTower(pygame.sprite.Sprite):
         archer_y = self.y + (self.height // 10) - 30
         window.blit(archer_image, (archer_x, archer_y))
 
-        # Update arrows and check collisions with enemies
-        self.arrows.update(enemies)
-        self.arrows.draw(window)
-
         # Draw the range circle
         #pygame.draw.circle(window, (0, 255, 0), (int(self.x + self.width // 2), int(self.y + self.height // 2)), self.attack_range, 1)
         
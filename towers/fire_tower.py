@@ -1,5 +1,7 @@
 import pygame
 import math
+from text_cache.textCache import TextCache
+from sprite_handler.spriteHandler import SpriteHandler
 
 
 class FireTower(pygame.sprite.Sprite):
@@ -28,8 +30,7 @@ class FireTower(pygame.sprite.Sprite):
         self.enemy_positions = {}
 
         # Load and scale the tower image
-        tower_image = pygame.image.load("assets/magic-tower-game-assets/PNG/3.png")
-        self.sprite = pygame.transform.scale(tower_image, (self.width, self.height))
+        self.sprite = SpriteHandler.load_sprite("assets/magic-tower-game-assets/PNG/3.png", self.width, self.height)
 
         # Create the rectangle for collision and positioning
         self.rect = self.sprite.get_rect()
@@ -41,10 +42,11 @@ class FireTower(pygame.sprite.Sprite):
             attack_sprite_paths.append(
                 f"assets/magic-effects-game-sprite/PNG/fire/1_effect_fire_0{i:02}.png"
             )
-        self.attack_imgs = [pygame.image.load(path) for path in attack_sprite_paths]
-
         # Scale down the fire animation frames to make them smaller
-        self.attack_imgs = [pygame.transform.scale(img, (int(img.get_width() // 10), int(img.get_height() // 10))) for img in self.attack_imgs]
+        self.attack_imgs = []
+        for path in attack_sprite_paths:
+            width, height = SpriteHandler.image_size(path)
+            self.attack_imgs.append(SpriteHandler.load_sprite(path, width // 10, height // 10))
 
         self.upgrade_button_visible = False
         self.upgrade_button_rect = None
@@ -76,17 +78,15 @@ class FireTower(pygame.sprite.Sprite):
         button_y = self.rect.top - button_height - 5  # Position above the tower
         self.upgrade_button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
         # Draw the button background (brown)
-        pygame.draw.rect(window, (139, 69, 19), self.upgrade_button_rect)  # Brown background
+        window.fill((139, 69, 19), self.upgrade_button_rect)  # Brown background
         # Add a border (grey contour)
         pygame.draw.rect(window, (128, 128, 128), self.upgrade_button_rect, 2)  # Grey border
-        # Initialize the font and render the text
+        # Render the 'Upgrade' text in white with anti-aliasing; the font and surface are cached
         try:
-            font = pygame.font.Font(None, 24)  # Slightly larger font for better readability
+            text_surface = TextCache.render("Upgrade", 24, (255, 255, 255), sysfont=False)  # Slightly larger font for better readability
         except pygame.error as e:
             print(f"Font initialization error: {e}")
             return  # Skip drawing if the font fails to load
-        # Render the 'Upgrade' text in white with anti-aliasing for smoothness
-        text_surface = font.render("Upgrade", True, (255, 255, 255))  # White text
         text_rect = text_surface.get_rect(center=self.upgrade_button_rect.center)
         window.blit(text_surface, text_rect)
 
@@ -116,8 +116,7 @@ class FireTower(pygame.sprite.Sprite):
         self.life += self.max_life
         print(self.life, "self.life")
         self.damage += 1
-        tower_image = pygame.image.load("assets/magic-tower-game-assets/PNG/4.png")
-        self.sprite = pygame.transform.scale(tower_image, (self.width, self.height))
+        self.sprite = SpriteHandler.load_sprite("assets/magic-tower-game-assets/PNG/4.png", self.width, self.height)
 
     def get_coord(self, cell_width, cell_height):
         col = int(self.rect.centerx / cell_width)
@@ -128,31 +127,52 @@ class FireTower(pygame.sprite.Sprite):
         distance = math.sqrt((self.x - enemy.pos.x) ** 2 + (self.y - enemy.pos.y) ** 2)
         return distance <= self.attack_range
 
+    def range_circle(self):
+        """Return (x, y, radius) of the area enemy_in_range checks."""
+        return self.x, self.y, self.attack_range
+
     def attack(self, enemies, current_time):
         # Determine which enemies to attack
-        self.enemies_to_attack = []
+        enemies_in_range = []
         for enemy in enemies:
             if self.enemy_in_range(enemy):
-                self.enemies_to_attack.append(enemy)
-        
-        # Attack the enemies
+                enemies_in_range.append(enemy)
+        self.attack_targets(enemies_in_range, current_time)
+
+    def attack_targets(self, enemies_in_range, current_time):
+        """Burn every enemy of an already range-filtered list."""
+        self.enemies_to_attack = enemies_in_range
+
+        # Attack the enemies near where their fireball was aimed
         for enemy in self.enemies_to_attack:
             if enemy.id in self.enemy_positions:
                 if (enemy.pos.x - enemy.pos.x * 0.1 <= self.enemy_positions[enemy.id][0] <= enemy.pos.x + enemy.pos.x * 0.1) or \
                     (enemy.pos.y - enemy.pos.y * 0.1 <= self.enemy_positions[enemy.id][1] <= enemy.pos.y + enemy.pos.y * 0.1):
                     enemy.take_damage(self.damage)
 
-    def throw_fireball(self, enemy, window, current_time):
-        if current_time - self.last_animation_time >= self.animation_speed:
+        self.aim_fireballs(current_time)
+
+    def aim_fireballs(self, current_time):
+        """
+        Advance the fireball animation and aim a fireball at every target.
+        Damage depends on where the fireballs were aimed, so this runs in the
+        simulation step, not in draw(), and headless games burn the same way.
+        """
+        if self.enemies_to_attack and current_time - self.last_animation_time >= self.animation_speed:
             self.attack_animation_index = (self.attack_animation_index + 1) % len(self.attack_imgs)
             self.last_animation_time = current_time
 
-        if enemy.id not in self.enemy_positions:
-            self.enemy_positions[enemy.id] = (enemy.pos.x, enemy.pos.y)
-        else:
-            if self.attack_animation_index == 18:
-                self.enemy_positions[enemy.id] = (enemy.pos.x, enemy.pos.y)
+        positions = {}
+        for enemy in self.enemies_to_attack:
+            # Re-aim when the animation reaches its last frame
+            if enemy.id not in self.enemy_positions or self.attack_animation_index == 18:
+                positions[enemy.id] = (enemy.pos.x, enemy.pos.y)
+            else:
+                positions[enemy.id] = self.enemy_positions[enemy.id]
+        # Only enemies still in range keep an aim point, so dead ones don't pile up
+        self.enemy_positions = positions
 
+    def throw_fireball(self, enemy, window):
         fireball_image = self.attack_imgs[self.attack_animation_index]
         x = self.enemy_positions[enemy.id][0]
         y = self.enemy_positions[enemy.id][1] - self.attack_imgs[0].get_height()
@@ -166,7 +186,8 @@ class FireTower(pygame.sprite.Sprite):
 
     def draw(self, window, current_time=None):
         for enemy in self.enemies_to_attack:
-            self.throw_fireball(enemy, window, current_time)
+            if enemy.id in self.enemy_positions:
+                self.throw_fireball(enemy, window)
 
         window.blit(self.sprite, (self.x, self.y))
 
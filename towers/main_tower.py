@@ -1,5 +1,7 @@
 import pygame
 import math
+from text_cache.textCache import TextCache
+from sprite_handler.spriteHandler import SpriteHandler
 
 
 class MainTower(pygame.sprite.Sprite):
@@ -25,8 +27,7 @@ class MainTower(pygame.sprite.Sprite):
         self.last_animation_time = 0  # Time since the last frame change
 
         # Load and scale the tower image
-        tower_image = pygame.image.load("assets/support-tower-game-assets/PNG/5.png")
-        self.sprite = pygame.transform.scale(tower_image, (self.width, self.height))  # Set the sprite
+        self.sprite = SpriteHandler.load_sprite("assets/support-tower-game-assets/PNG/5.png", self.width, self.height)  # Set the sprite
 
         # Create the rectangle for collision and positioning
         self.rect = self.sprite.get_rect()
@@ -73,17 +74,15 @@ class MainTower(pygame.sprite.Sprite):
         button_y = self.rect.top - button_height - 5  # Position above the tower
         self.upgrade_button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
         # Draw the button background (brown)
-        pygame.draw.rect(window, (139, 69, 19), self.upgrade_button_rect)  # Brown background
+        window.fill((139, 69, 19), self.upgrade_button_rect)  # Brown background
         # Add a border (grey contour)
         pygame.draw.rect(window, (128, 128, 128), self.upgrade_button_rect, 2)  # Grey border
-        # Initialize the font and render the text
+        # Render the 'Upgrade' text in white with anti-aliasing; the font and surface are cached
         try:
-            font = pygame.font.Font(None, 24)  # Slightly larger font for better readability
+            text_surface = TextCache.render("Upgrade", 24, (255, 255, 255), sysfont=False)  # Slightly larger font for better readability
         except pygame.error as e:
             print(f"Font initialization error: {e}")
             return  # Skip drawing if the font fails to load
-        # Render the 'Upgrade' text in white with anti-aliasing for smoothness
-        text_surface = font.render("Upgrade", True, (255, 255, 255))  # White text
         text_rect = text_surface.get_rect(center=self.upgrade_button_rect.center)
         window.blit(text_surface, text_rect)
 
@@ -113,12 +112,11 @@ class MainTower(pygame.sprite.Sprite):
         self.max_life += 1000
         self.life += 1000
         self.damage += 1
-        tower_image = pygame.image.load("assets/support-tower-game-assets/PNG/6.png")
-        self.sprite = pygame.transform.scale(tower_image, (self.width, self.height))  # Set the sprite
+        self.sprite = SpriteHandler.load_sprite("assets/support-tower-game-assets/PNG/6.png", self.width, self.height)  # Set the sprite
 
     def load_attack_sprites(self, sprite_paths):
         """Load attack animation sprites."""
-        self.attack_imgs = [pygame.image.load(path) for path in sprite_paths]
+        self.attack_imgs = [SpriteHandler.load_image(path) for path in sprite_paths]
 
     def get_coord(self, cell_width, cell_height):
         """Return the column and row based on the tower's position."""
@@ -137,11 +135,17 @@ class MainTower(pygame.sprite.Sprite):
         distance = math.hypot(tower_center_x - enemy_center_x, tower_center_y - enemy_center_y)
         return distance <= self.range
 
+    def range_circle(self):
+        """Return (x, y, radius) of the area is_in_range checks."""
+        return self.x + self.width // 2, self.y + self.height // 2, self.range
+
     def attack(self, enemies, current_time):
         """Attack an enemy if enough time has passed."""
         # Find enemies in range
-        enemies_in_range = [enemy for enemy in enemies if self.is_in_range(enemy)]
+        self.attack_targets([enemy for enemy in enemies if self.is_in_range(enemy)], current_time)
 
+    def attack_targets(self, enemies_in_range, current_time):
+        """Attack the first enemy of an already range-filtered list."""
         if enemies_in_range:
             # Attack the first enemy in the list (you can change targeting logic)
             target_enemy = enemies_in_range[0]
@@ -166,11 +170,11 @@ class MainTower(pygame.sprite.Sprite):
         fill_width = int((self.life / self.max_life) * health_bar_width)
 
         # Draw the contour (black border) of the health bar
-        pygame.draw.rect(window, (0, 0, 0), (health_bar_x - 1, health_bar_y - 1, health_bar_width + 2, health_bar_height + 2))
+        window.fill((0, 0, 0), (health_bar_x - 1, health_bar_y - 1, health_bar_width + 2, health_bar_height + 2))
 
         # Draw the background (red) and foreground (green) of the health bar
-        pygame.draw.rect(window, (255, 0, 0), (health_bar_x, health_bar_y, health_bar_width, health_bar_height))
-        pygame.draw.rect(window, (0, 255, 0), (health_bar_x, health_bar_y, fill_width, health_bar_height))
+        window.fill((255, 0, 0), (health_bar_x, health_bar_y, health_bar_width, health_bar_height))
+        window.fill((0, 255, 0), (health_bar_x, health_bar_y, fill_width, health_bar_height))
 
 
 
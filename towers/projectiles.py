@@ -0,0 +1,127 @@
+import os
+import math
+
+import numpy as np
+import pygame
+
+from sprite_handler.spriteHandler import SpriteHandler
+
+
+class ProjectilePool:
+    """
+    All arrows in flight, shared by every archer tower.
+    Positions, velocities and damage live in preallocated arrays; freed slots
+    are reused by the next shot. update() moves everything in one pass and only
+    hit-tests each arrow against the enemies the spatial hash puts near it.
+    """
+    # Arrow sprite pre-rotated to ANGLES evenly spaced directions, built once
+    ANGLES = 64
+    rotated_images = None
+    half_sizes = None  # sprite index -> (half width, half height)
+
+    @classmethod
+    def load_images(cls):
+        if cls.rotated_images is None:
+            image = SpriteHandler.load_sprite(os.path.join("assets/archer-tower-game-assets/PNG", "37.png"), 20, 10)  # Adjust size as needed
+            step = 360 / cls.ANGLES
+            cls.rotated_images = [pygame.transform.rotate(image, -i * step) for i in range(cls.ANGLES)]
+            cls.half_sizes = np.array([img.get_size() for img in cls.rotated_images], dtype=np.float64) / 2
+        return cls.rotated_images
+
+    def __init__(self, capacity=128):
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)   # sprite centers
+        self.prev_pos = np.zeros((capacity, 2), dtype=np.float64)  # before the last tick, for interpolation
+        self.vel = np.zeros((capacity, 2), dtype=np.float64)
+        self.damage = np.zeros(capacity, dtype=np.float64)
+        self.sprite = np.zeros(capacity, dtype=np.int32)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return len(self.pos) - len(self.free)
+
+    def grow(self):
+        capacity = len(self.pos)
+        for name in ("pos", "prev_pos", "vel", "damage", "sprite", "active"):
+            array = getattr(self, name)
+            new = np.zeros((capacity * 2,) + array.shape[1:], dtype=array.dtype)
+            new[:capacity] = array
+            setattr(self, name, new)
+        self.free.extend(range(capacity * 2 - 1, capacity - 1, -1))
+
+    def spawn(self, start_x, start_y, target_x, target_y, damage, speed=10):
+        """Fire an arrow from start towards target."""
+        self.load_images()
+        if not self.free:
+            self.grow()
+        slot = self.free.pop()
+
+        angle = math.atan2(target_y - start_y, target_x - start_x)
+        self.pos[slot] = (start_x, start_y)
+        self.prev_pos[slot] = self.pos[slot]
+        self.vel[slot] = (math.cos(angle) * speed, math.sin(angle) * speed)
+        self.damage[slot] = damage
+        # Pick the pre-rotated sprite closest to the arrow's direction
+        self.sprite[slot] = round(math.degrees(angle) / (360 / self.ANGLES)) % self.ANGLES
+        self.active[slot] = True
+
+    def release(self, slots):
+        self.active[slots] = False
+        self.free.extend(np.atleast_1d(slots).tolist())
+
+    def clear(self):
+        self.release(np.flatnonzero(self.active))
+
+    def update(self, enemy_index, bounds, scale=1.0):
+        """
+        Move every arrow one tick, damage the first enemy each one hits and drop
+        arrows that hit something or leave bounds (a pygame.Rect). enemy_index
+        must have been rebuilt this tick. Velocities are per tick; scale
+        stretches the tick.
+        """
+        slots = np.flatnonzero(self.active)
+        if len(slots) == 0:
+            return
+
+        self.prev_pos[slots] = self.pos[slots]
+        self.pos[slots] += self.vel[slots] * scale
+        pos = self.pos[slots]
+        half = self.half_sizes[self.sprite[slots]]
+        top_left = pos - half
+        size = half * 2
+
+        # Broad phase: only enemies in the cells around the arrow
+        reach = float(np.hypot(*half.max(axis=0))) + enemy_index.max_extent
+        spent = []
+        for slot, (x, y), corner, extent in zip(slots.tolist(), pos.tolist(), top_left.tolist(), size.tolist()):
+            candidates = enemy_index.query(x, y, reach)
+            if not candidates:
+                continue
+            rect = pygame.Rect(corner, extent)
+            for enemy in candidates:
+                if rect.colliderect(enemy.rect):
+                    enemy.take_damage(float(self.damage[slot]) * 0.5)  # Apply damage from the arrow
+                    spent.append(slot)
+                    break
+
+        # Arrows must stay fully inside the screen
+        outside = (
+            (top_left[:, 0] < bounds.left) | (top_left[:, 1] < bounds.top) |
+            (top_left[:, 0] + size[:, 0] > bounds.right) | (top_left[:, 1] + size[:, 1] > bounds.bottom)
+        )
+        spent = set(spent)
+        spent.update(slots[outside].tolist())
+        if spent:
+            self.release(np.fromiter(spent, dtype=np.intp))
+
+    def draw(self, window, alpha=1.0):
+        """Draw every arrow, alpha of the way from its previous position to its current one."""
+        slots = np.flatnonzero(self.active)
+        if len(slots) == 0:
+            return
+        images = self.rotated_images
+        sprites = self.sprite[slots].tolist()
+        prev = self.prev_pos[slots]
+        pos = prev + (self.pos[slots] - prev) * alpha
+        corners = (pos - self.half_sizes[self.sprite[slots]]).astype(np.int32).tolist()
+        window.blits([(images[s], corner) for s, corner in zip(sprites, corners)], doreturn=False)
@@ -0,0 +1,42 @@
+import numpy as np
+
+
+# Below this many tower/enemy pairs each tower's plain Python scan of the enemy
+# list is cheaper than building the arrays; see tools/bench_targeting.py
+BATCHED_TARGETING_MIN_PAIRS = 200
+
+# Below the batched threshold, a tower whose range box covers at most this share
+# of the map asks the spatial hash instead of scanning every enemy. Wider ranges
+# touch most of the hash's cells, so the query costs more than it prunes.
+HASH_TARGETING_MAX_COVER = 0.25
+
+
+def hash_prunes(tower, width, height):
+    """True if the tower's range box covers little enough of the map for a hash query to pay off."""
+    x, y, radius = tower.range_circle()
+    covered_w = max(0, min(x + radius, width) - max(x - radius, 0))
+    covered_h = max(0, min(y + radius, height) - max(y - radius, 0))
+    return covered_w * covered_h <= HASH_TARGETING_MAX_COVER * width * height
+
+
+def batched_targets(towers, store):
+    """
+    Work out every tower's enemies in range in one vectorized pass.
+    Builds the full towers x enemies squared-distance matrix from the enemy
+    store's packed positions and each tower's range_circle(). Returns one list
+    per tower, with the enemies in spawn order (= the game's list order).
+    """
+    n = store.count
+    if n == 0 or not towers:
+        return [[] for _ in towers]
+
+    circles = np.array([tower.range_circle() for tower in towers], dtype=np.float64)
+    # Columns in spawn order, so every row already comes out in list order
+    order = store.spawn_order()
+    pos = store.pos[order]
+    dx = pos[None, :, 0] - circles[:, 0, None]
+    dy = pos[None, :, 1] - circles[:, 1, None]
+    in_range = dx * dx + dy * dy <= (circles[:, 2] ** 2)[:, None]
+
+    enemies = [store.enemies[i] for i in order.tolist()]
+    return [[enemies[i] for i in np.flatnonzero(row).tolist()] for row in in_range]
@@ -1,6 +1,7 @@
 # tower.py
 import pygame
 from game_object.gameObject import GameObject
+from sprite_handler.spriteHandler import SpriteHandler
 import math
 
 
@@ -24,7 +25,7 @@ class Tower(GameObject):
 
     def load_attack_sprites(self, sprite_paths):
         """Load attack animation sprites."""
-        self.attack_imgs = [pygame.image.load(path) for path in sprite_paths]
+        self.attack_imgs = [SpriteHandler.load_image(path) for path in sprite_paths]
 
     def is_in_range(self, enemy):
         """Check if an enemy is within range."""
@@ -37,11 +38,17 @@ class Tower(GameObject):
         distance = math.hypot(tower_center_x - enemy_center_x, tower_center_y - enemy_center_y)
         return distance <= self.range
 
+    def range_circle(self):
+        """Return (x, y, radius) of the area is_in_range checks."""
+        return self.x + self.width // 2, self.y + self.height // 2, self.range
+
     def attack(self, enemies, current_time):
         """Attack an enemy if enough time has passed."""
         # Find enemies in range
-        enemies_in_range = [enemy for enemy in enemies if self.is_in_range(enemy)]
+        self.attack_targets([enemy for enemy in enemies if self.is_in_range(enemy)], current_time)
 
+    def attack_targets(self, enemies_in_range, current_time):
+        """Attack the first enemy of an already range-filtered list."""
         if enemies_in_range:
             # Attack the first enemy in the list (you can change targeting logic)
             target_enemy = enemies_in_range[0]
@@ -57,7 +64,7 @@ class Tower(GameObject):
                     int(target_enemy.y + target_enemy.height / 2)
                 )
 
-    def draw(self, window):
+    def draw(self, window, current_time=None):
         """Draw the tower and its range."""
         # Draw the tower's default sprite
         super().draw(window)
@@ -69,7 +76,8 @@ class Tower(GameObject):
 
         # If attacking, draw attack animation at the target enemy's position
         if self.is_attacking and self.attack_imgs and self.target_enemy_pos:
-            current_time = pygame.time.get_ticks()
+            if current_time is None:
+                current_time = pygame.time.get_ticks()
             if current_time - self.last_animation_time >= self.animation_speed:
                 self.last_animation_time = current_time
                 self.attack_animation_index += 1
@@ -0,0 +1,110 @@
+import math
+import heapq
+
+
+class TowerIndex:
+    """
+    Grid buckets over tower positions for nearest-tower lookups.
+    Towers don't move, so the index is only rebuilt when one is placed,
+    upgraded or removed. Queries search outwards ring by ring from the cell
+    under the point and stop as soon as no farther ring can hold a closer tower.
+    """
+    # With this few towers a plain scan is cheaper than the ring search
+    LINEAR_SCAN_MAX = 40
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.buckets = {}  # (col, row) -> [(order, tower, x, y), ...]
+        self.bounds = None  # (col_min, row_min, col_max, row_max) of the occupied buckets
+        self.entries = []
+
+    def rebuild(self, towers):
+        buckets = {}
+        self.entries = []
+        for order, tower in enumerate(towers):
+            key = (int(tower.x // self.cell_size), int(tower.y // self.cell_size))
+            entry = (order, tower, tower.x, tower.y)
+            buckets.setdefault(key, []).append(entry)
+            self.entries.append(entry)
+        self.buckets = buckets
+        if buckets:
+            cols = [col for col, _ in buckets]
+            rows = [row for _, row in buckets]
+            self.bounds = (min(cols), min(rows), max(cols), max(rows))
+        else:
+            self.bounds = None
+
+    def ring(self, col, row, r):
+        """Cells exactly r cells away (Chebyshev) from (col, row)."""
+        if r == 0:
+            yield col, row
+            return
+        for c in range(col - r, col + r + 1):
+            yield c, row - r
+            yield c, row + r
+        for rw in range(row - r + 1, row + r):
+            yield col - r, rw
+            yield col + r, rw
+
+    def nearest(self, x, y, k=1, alive_only=True):
+        """
+        Return up to k [(tower, distance), ...] closest to (x, y), nearest first.
+        Equal distances keep the order the towers were given to rebuild().
+        Towers with no life left are skipped unless alive_only is False.
+        """
+        if self.bounds is None:
+            return []
+        if len(self.entries) <= self.LINEAR_SCAN_MAX:
+            if k == 1:
+                nearest, min_distance = None, math.inf
+                for _, tower, tx, ty in self.entries:
+                    if alive_only and tower.life <= 0:
+                        continue
+                    distance = (tx - x) * (tx - x) + (ty - y) * (ty - y)
+                    if distance < min_distance:
+                        nearest, min_distance = tower, distance
+                return [(nearest, math.sqrt(min_distance))] if nearest is not None else []
+            found = [
+                ((tx - x) ** 2 + (ty - y) ** 2, order, tower)
+                for order, tower, tx, ty in self.entries
+                if not alive_only or tower.life > 0
+            ]
+            return [(tower, math.sqrt(distance)) for distance, _, tower in heapq.nsmallest(k, found)]
+
+        size = self.cell_size
+        col, row = int(x // size), int(y // size)
+        col_min, row_min, col_max, row_max = self.bounds
+        last_ring = max(col - col_min, col_max - col, row - row_min, row_max - row)
+
+        buckets = self.buckets
+        found = []  # (squared distance, order, tower)
+        for r in range(last_ring + 1):
+            if 8 * r > len(buckets):
+                # Sparse grid: walking the occupied buckets beats walking the empty rings
+                keys = [(c, rw) for c, rw in buckets if max(abs(c - col), abs(rw - row)) >= r]
+                r = last_ring
+            else:
+                keys = self.ring(col, row, r)
+            for key in keys:
+                bucket = buckets.get(key)
+                if not bucket:
+                    continue
+                for order, tower, tx, ty in bucket:
+                    if alive_only and tower.life <= 0:
+                        continue
+                    found.append(((tx - x) ** 2 + (ty - y) ** 2, order, tower))
+            if r == last_ring:
+                break
+
+            if len(found) >= k:
+                # Anything outside the searched block is at least this far away
+                reach = min(
+                    x - (col - r) * size, (col + r + 1) * size - x,
+                    y - (row - r) * size, (row + r + 1) * size - y
+                )
+                found.sort()
+                if found[k - 1][0] <= reach * reach:
+                    break
+
+        found.sort()
+        return [(tower, math.sqrt(distance)) for distance, _, tower in found[:k]]